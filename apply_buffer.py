@@ -2,30 +2,36 @@
 Apply 5-point buffer to predictions automatically
 """
 
+import os
 import pandas as pd
-from config import PREDICTIONS_CSV
+from config import PREDICTIONS_CSV, PREDICTIONS_PARQUET
 
 def apply_buffer(buffer_points=5):
     """Apply buffer to all predictions"""
-    
-    # Load predictions
-    df = pd.read_csv(PREDICTIONS_CSV)
-    
-    # Apply buffer
-    df['original_minimum'] = df['recommended_minimum']
-    df['recommended_minimum'] = df['recommended_minimum'] - buffer_points
-    
+
+    # Load predictions (Parquet when available, CSV otherwise)
+    if os.path.exists(PREDICTIONS_PARQUET):
+        df = pd.read_parquet(PREDICTIONS_PARQUET)
+    else:
+        df = pd.read_csv(PREDICTIONS_CSV)
+
+    # Apply buffer in place (numexpr-backed when available)
+    df.eval('original_minimum = recommended_minimum', inplace=True)
+    df.eval('recommended_minimum = recommended_minimum - @buffer_points', inplace=True)
+
     # Save back
+    df.to_parquet(PREDICTIONS_PARQUET, compression='zstd', engine='pyarrow')
     df.to_csv(PREDICTIONS_CSV, index=False)
-    
-    # Also update dated file if it exists
-    import os
+
+    # Also update dated file if it exists - a file copy is much cheaper
+    # than serializing the CSV a second time
+    import shutil
     from datetime import datetime
     date_str = datetime.now().strftime('%Y-%m-%d')
     dated_file = PREDICTIONS_CSV.replace('.csv', f'_{date_str}.csv')
-    
+
     if os.path.exists(dated_file):
-        df.to_csv(dated_file, index=False)
+        shutil.copyfile(PREDICTIONS_CSV, dated_file)
     
     print(f"✓ Applied {buffer_points}-point buffer to {len(df)} predictions")
     print(f"\nExample:")
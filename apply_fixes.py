@@ -0,0 +1,382 @@
+"""
+Apply the accumulated fixes to main.py in one pass, structurally
+
+Consolidates fix_strings.py, fix_predictions_simple.py and
+fix_game_matching.py: broken log lines are re-joined first, then the
+make_predictions method is replaced on the AST instead of by string
+search-and-splice. main.py is read and written exactly once.
+"""
+
+import ast
+import re
+import sys
+from pathlib import Path
+
+# Matches a logger/print call left dangling with an open quote;
+# compiled once instead of six endswith tests per line
+OPEN_QUOTE_SUFFIX = re.compile(r'(?:logger\.(?:info|warning|error)|print)\(f?"$')
+
+# The two known-good method bodies, kept as real source so they can
+# be parsed straight onto the AST
+SIMPLE_METHOD = r'''def make_predictions(self):
+        """
+        Generate predictions - SIMPLE VERSION
+        1. Get players with lines from Odds API
+        2. Match to our stats
+        3. Calculate minimum
+        """
+        logger.info("=" * 60)
+        logger.info("GENERATING PREDICTIONS")
+        logger.info("=" * 60)
+        
+        # Load model
+        if not self.predictor.load_model():
+            logger.error("No trained model found")
+            return None
+        
+        # 1. GET PLAYERS WITH LINES FROM ODDS API
+        logger.info("\nFetching players with prop lines from Odds API...")
+        odds_df = self.odds_fetcher.get_latest_props_for_prediction()
+        
+        if odds_df is None or odds_df.empty:
+            logger.error("No odds data available")
+            return None
+        
+        logger.info(f"Found {len(odds_df)} players with prop lines")
+        
+        # 2. LOAD OUR PLAYER STATS
+        logger.info("Loading player statistics...")
+        try:
+            from config import PLAYER_STATS_CSV
+            stats_df = pd.read_csv(
+                PLAYER_STATS_CSV,
+                usecols=['Player', 'Team', 'PTS', 'TRB', 'AST'],
+                dtype={'Player': 'string', 'Team': 'string',
+                       'PTS': 'float32', 'TRB': 'float32', 'AST': 'float32'}
+            )
+        except FileNotFoundError:
+            logger.error("Player stats not found")
+            return None
+        
+        # 3. MATCH AND CALCULATE (one merge instead of per-row scans)
+        calc = MinimumLineCalculator()
+
+        # Normalize first/last name keys once on both frames
+        stats_df['first_lc'] = stats_df['Player'].str.split().str[0].str.lower()
+        stats_df['last_lc'] = stats_df['Player'].str.split().str[-1].str.lower()
+        stats_df = stats_df.drop_duplicates(subset=['first_lc', 'last_lc'], keep='first')
+        odds_df['first_lc'] = odds_df['player_name'].str.split().str[0].str.lower()
+        odds_df['last_lc'] = odds_df['player_name'].str.split().str[-1].str.lower()
+
+        merged = odds_df.merge(stats_df, on=['first_lc', 'last_lc'], how='inner')
+
+        # Compute PRA and drop low-production players in one pass
+        merged['pra_avg'] = merged[['PTS', 'TRB', 'AST']].sum(axis=1)
+        merged = merged[merged['pra_avg'] >= 5.0]
+
+        # One batched calculator call over the whole merged frame
+        min_arr, conf_arr, reason_arr = calc.calculate_realistic_minimum_batch(
+            {
+                'pts_reb_ast_avg': merged['pra_avg'].to_numpy(),
+                'last_5_avg': merged['pra_avg'].to_numpy(),
+                'consistency': 0.85
+            },
+            merged['line'].to_numpy()
+        )
+
+        merged['recommended_minimum'] = min_arr
+        merged['confidence'] = conf_arr
+        merged['reasoning'] = reason_arr
+        merged = merged[merged['recommended_minimum'].notna()]
+
+        if merged.empty:
+            logger.info("No predictions generated")
+            return None
+
+        # Build the predictions frame straight from columns - no
+        # intermediate list of dicts
+        pred_df = pd.DataFrame({
+            'player_name': merged['player_name'],
+            'team': merged['Team'] if 'Team' in merged.columns else 'Unknown',
+            'dk_line': merged['line'],
+            'has_dk_line': True,
+            'recommended_minimum': merged['recommended_minimum'],
+            'season_avg': merged['pra_avg'],
+            'pts_avg': merged['PTS'],
+            'reb_avg': merged['TRB'],
+            'ast_avg': merged['AST'],
+            'confidence': merged['confidence'],
+            'meets_threshold': merged['confidence'] >= 0.90,
+            'reasoning': merged['reasoning'],
+            'home_team': merged['home_team'],
+            'away_team': merged['away_team'],
+            'game': merged['away_team'] + ' @ ' + merged['home_team'],
+            'game_time': merged['commence_time'],
+            'timestamp': datetime.now().isoformat()
+        })
+        
+        # Remove duplicates
+        pred_df = pred_df.drop_duplicates(subset=['player_name', 'game'], keep='first')
+        
+        # Sort by game, then by confidence
+        pred_df = pred_df.sort_values(['game', 'confidence'], ascending=[True, False])
+        
+        # Save
+        pred_df.to_csv(PREDICTIONS_CSV, index=False)
+        
+        high_conf = len(pred_df[pred_df['meets_threshold']])
+        games = pred_df['game'].nunique()
+        
+        logger.info(f"\n✓ Generated {len(pred_df)} predictions")
+        logger.info(f"   - {high_conf} high confidence (90%+)")
+        logger.info(f"   - {games} games")
+        logger.info(f"Saved to {PREDICTIONS_CSV}")
+        
+        return pred_df'''
+
+GAME_MATCHING_METHOD = r'''def make_predictions(self, show_all=True):
+        """
+        Generate predictions for current props with realistic minimum lines
+        Only shows players actually in today's games
+        """
+        logger.info("=" * 60)
+        logger.info("GENERATING PREDICTIONS WITH MINIMUM LINES")
+        logger.info("=" * 60)
+        
+        # Load trained model
+        if not self.predictor.load_model():
+            logger.error("No trained model found. Please train model first.")
+            return None
+        
+        # Get latest odds - THIS TELLS US WHICH GAMES ARE HAPPENING
+        logger.info("\nLoading latest prop lines...")
+        odds_df = self.odds_fetcher.get_latest_props_for_prediction()
+        
+        if odds_df is None or odds_df.empty:
+            logger.error("No odds data available - cannot determine today's games")
+            return None
+        
+        logger.info(f"Found {len(odds_df)} prop lines from sportsbooks")
+        
+        # Get unique games happening today
+        games_today = odds_df[['home_team', 'away_team', 'commence_time']].drop_duplicates()
+        logger.info(f"Games today: {len(games_today)}")
+        
+        # Get player stats
+        logger.info("\nLoading player statistics...")
+        try:
+            from config import PLAYER_STATS_CSV
+            stats_df = pd.read_csv(
+                PLAYER_STATS_CSV,
+                usecols=['Player', 'Team', 'PTS', 'TRB', 'AST', 'MP', 'G'],
+                dtype={'Player': 'string', 'Team': 'string',
+                       'PTS': 'float32', 'TRB': 'float32', 'AST': 'float32',
+                       'MP': 'float32', 'G': 'float32'}
+            )
+        except FileNotFoundError:
+            logger.error("Player stats not found. Please update data first.")
+            return None
+        
+        # Initialize minimum line calculator
+        calc = MinimumLineCalculator()
+        
+        predictions = []
+
+        # Normalize odds names once and index lines by (first name, game)
+        odds_df['first_lc'] = odds_df['player_name'].str.split().str[0].str.lower()
+        odds_lookup = {}
+        for odds_row in odds_df.itertuples(index=False):
+            odds_lookup.setdefault(
+                (odds_row.first_lc, odds_row.home_team, odds_row.away_team),
+                odds_row.line
+            )
+
+        # Bucket players by 3-letter team prefix once, instead of two
+        # contains() scans over the stats frame per game
+        stats_df['team3'] = stats_df['Team'].astype(str).str.upper().str[:3]
+        by_team = {team: group for team, group in stats_df.groupby('team3')}
+        empty_players = stats_df.iloc[0:0]
+
+        # Process each game
+        for home_team, away_team, game_time in games_today.itertuples(index=False, name=None):
+            
+            logger.info(f"\nProcessing: {away_team} @ {home_team}")
+            
+            # Get players from BOTH teams in this game (dict lookups)
+            game_players = pd.concat([
+                by_team.get(home_team[:3].upper(), empty_players),
+                by_team.get(away_team[:3].upper(), empty_players)
+            ]).copy()
+            
+            # Filter to rotation players (10+ mins, 5+ games)
+            game_players = game_players[
+                (game_players['MP'] >= 10.0) & 
+                (game_players['G'] >= 5)
+            ].copy()
+            
+            # Sort by PRA average (stars first)
+            game_players['PRA'] = game_players['PTS'] + game_players['TRB'] + game_players['AST']
+            game_players = game_players.sort_values('PRA', ascending=False)
+            
+            # Take top 12 players per game (6 starters + 6 bench typically)
+            game_players = game_players.head(12)
+            
+            logger.info(f"  Found {len(game_players)} rotation players for this game")
+            
+            # Process each player
+            for player_row in game_players.itertuples(index=False):
+                player_name = player_row.Player
+                team = player_row.Team
+
+                pts_avg = getattr(player_row, 'PTS', 0)
+                reb_avg = getattr(player_row, 'TRB', 0)
+                ast_avg = getattr(player_row, 'AST', 0)
+                pra_avg = pts_avg + reb_avg + ast_avg
+                
+                # Skip very low production players
+                if pra_avg < 5.0:
+                    continue
+                
+                # Find if this player has an odds line (O(1) lookup)
+                main_line = odds_lookup.get(
+                    (player_name.split()[0].lower(), home_team, away_team)
+                )
+
+                if main_line is not None:
+                    has_line = True
+                else:
+                    main_line = pra_avg
+                    has_line = False
+                
+                # Calculate minimum line
+                player_stats_dict = {
+                    'pts_reb_ast_avg': pra_avg,
+                    'last_5_avg': pra_avg,
+                    'consistency': 0.85
+                }
+                
+                min_line, confidence, reasoning = calc.calculate_realistic_minimum(
+                    player_stats_dict, main_line
+                )
+                
+                if min_line is None:
+                    continue
+                
+                meets_threshold = confidence >= 0.90
+                
+                predictions.append({
+                    'player_name': player_name,
+                    'team': team,
+                    'dk_line': main_line,
+                    'has_dk_line': has_line,
+                    'recommended_minimum': min_line,
+                    'season_avg': pra_avg,
+                    'pts_avg': pts_avg,
+                    'reb_avg': reb_avg,
+                    'ast_avg': ast_avg,
+                    'confidence': confidence,
+                    'meets_threshold': meets_threshold,
+                    'reasoning': reasoning,
+                    'home_team': home_team,
+                    'away_team': away_team,
+                    'game': f"{away_team} @ {home_team}",
+                    'game_time': game_time,
+                    'timestamp': datetime.now().isoformat()
+                })
+        
+        if not predictions:
+            logger.info("\nNo predictions generated")
+            return None
+        
+        # Create predictions DataFrame
+        pred_df = pd.DataFrame(predictions)
+        
+        # Remove duplicates (same player might appear twice if odds parser duplicated)
+        pred_df = pred_df.drop_duplicates(subset=['player_name', 'game'], keep='first')
+        
+        # Sort by game, then by season average
+        pred_df = pred_df.sort_values(
+            ['game', 'season_avg'], 
+            ascending=[True, False]
+        )
+        
+        # Save predictions
+        pred_df.to_csv(PREDICTIONS_CSV, index=False)
+        
+        high_conf_count = len(pred_df[pred_df['meets_threshold']])
+        
+        logger.info(f"\n✓ Generated {len(pred_df)} total predictions")
+        logger.info(f"   - {high_conf_count} meet 90%+ threshold")
+        logger.info(f"   - {len(games_today)} games covered")
+        logger.info(f"Saved to {PREDICTIONS_CSV}")
+        
+        return pred_df'''
+
+TEMPLATES = {
+    'simple': SIMPLE_METHOD,
+    'game-matching': GAME_MATCHING_METHOD
+}
+
+
+def join_broken_log_lines(content):
+    """Re-join logger/print calls that were split mid-string"""
+    lines = content.splitlines(keepends=True)
+    output = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        stripped = line.strip()
+        if OPEN_QUOTE_SUFFIX.search(stripped):
+
+            # This is a broken line, join with next
+            if i + 1 < len(lines):
+                next_line = lines[i + 1]
+                output.append(line.rstrip() + '\\n' + next_line.lstrip())
+                i += 2
+                continue
+
+        output.append(line)
+        i += 1
+
+    return ''.join(output)
+
+
+def replace_make_predictions(content, method_source):
+    """Swap the make_predictions method on the AST"""
+    tree = ast.parse(content)
+    new_method = ast.parse(method_source).body[0]
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == 'NBAPropSystem':
+            for i, item in enumerate(node.body):
+                if isinstance(item, ast.FunctionDef) and item.name == 'make_predictions':
+                    node.body[i] = new_method
+                    return ast.unparse(tree) + '\n'
+            # No existing method - append it
+            node.body.append(new_method)
+            return ast.unparse(tree) + '\n'
+
+    raise SystemExit('✗ Could not find class NBAPropSystem in main.py')
+
+
+def main():
+    variant = sys.argv[1] if len(sys.argv) > 1 else 'simple'
+
+    if variant not in TEMPLATES:
+        print('Usage: python apply_fixes.py [simple|game-matching]')
+        return
+
+    path = Path('main.py')
+    content = path.read_text(encoding='utf-8')
+
+    content = join_broken_log_lines(content)
+    content = replace_make_predictions(content, TEMPLATES[variant])
+
+    path.write_text(content, encoding='utf-8')
+
+    print(f"✓ Applied {variant} make_predictions fix to main.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,12 @@ def analyze_margins(backtest_results_file):
     Analyze how close predictions were and test buffer strategies
     """
     df = pd.read_csv(backtest_results_file)
-    
+
+    # Flag columns are stored as 0/1; keep them int8 in memory
+    # (older files with True/False still parse via the bool path)
+    df['hit'] = df['hit'].astype(np.int8)
+    df['meets_90_threshold'] = df['meets_90_threshold'].astype(np.int8)
+
     print("\n" + "="*80)
     print("PREDICTION MARGIN ANALYSIS")
     print("="*80)
@@ -47,14 +52,13 @@ def analyze_margins(backtest_results_file):
         (20, float('inf'), 'Won by 20+ points')
     ]
     
-    for min_val, max_val, label in bins:
-        if min_val == -float('inf'):
-            count = len(df[df['margin'] < max_val])
-        elif max_val == float('inf'):
-            count = len(df[df['margin'] >= min_val])
-        else:
-            count = len(df[(df['margin'] >= min_val) & (df['margin'] < max_val)])
-        
+    # One digitize pass buckets every margin at once instead of a
+    # boolean scan per bin
+    edges = np.array([min_val for min_val, _, _ in bins[1:]])
+    bucket_idx = np.digitize(df['margin'].to_numpy(), edges)
+    counts = np.bincount(bucket_idx, minlength=len(bins))
+
+    for (min_val, max_val, label), count in zip(bins, counts):
         pct = (count / len(df)) * 100
         print(f"{label:30} {count:4d} picks ({pct:5.1f}%)")
     
@@ -64,27 +68,30 @@ def analyze_margins(backtest_results_file):
     print("="*80)
     
     buffers = [0, 2, 3, 5, 7, 10]
-    
+
+    # Single (N, buffers) broadcast instead of two new DataFrame columns
+    # per buffer value
+    pra = df['actual_pra'].to_numpy()
+    rec_min = df['recommended_minimum'].to_numpy()
+    buffers_arr = np.array(buffers)
+    hits = pra[:, None] >= (rec_min[:, None] - buffers_arr[None, :])
+
+    total = len(df)
+    win_counts = hits.sum(axis=0)
+    high_conf_mask = df['meets_90_threshold'].to_numpy(dtype=bool)
+
     results = []
-    
-    for buffer in buffers:
-        # Calculate win rate with buffer
-        df[f'buffered_min_{buffer}'] = df['recommended_minimum'] - buffer
-        df[f'hit_with_{buffer}_buffer'] = df['actual_pra'] >= df[f'buffered_min_{buffer}']
-        
-        total = len(df)
-        wins = df[f'hit_with_{buffer}_buffer'].sum()
+
+    for j, buffer in enumerate(buffers):
+        wins = int(win_counts[j])
         win_rate = (wins / total) * 100
-        
+
         # For high confidence only
-        high_conf = df[df['meets_90_threshold']]
-        if not high_conf.empty:
-            hc_wins = high_conf[f'hit_with_{buffer}_buffer'].sum()
-            hc_total = len(high_conf)
-            hc_rate = (hc_wins / hc_total) * 100
+        if high_conf_mask.any():
+            hc_rate = hits[high_conf_mask, j].mean() * 100
         else:
             hc_rate = 0
-        
+
         results.append({
             'buffer': buffer,
             'total_picks': total,
@@ -92,6 +99,10 @@ def analyze_margins(backtest_results_file):
             'win_rate': win_rate,
             'high_conf_rate': hc_rate
         })
+
+    # Only the 5-point buffer columns are needed downstream
+    df['buffered_min_5'] = rec_min - 5
+    df['hit_with_5_buffer'] = hits[:, buffers.index(5)]
     
     print("\n📊 ALL PREDICTIONS:")
     print(f"{'Buffer':<10} {'Wins':<10} {'Total':<10} {'Win Rate':<15}")
@@ -110,7 +121,7 @@ def analyze_margins(backtest_results_file):
     print("PICKS SAVED BY 5-POINT BUFFER (Lost without buffer, Won with buffer)")
     print("="*80)
     
-    saved = df[(~df['hit']) & (df['hit_with_5_buffer'])]
+    saved = df[~df['hit'].astype(bool) & df['hit_with_5_buffer']]
     
     if not saved.empty:
         print(f"\nTotal picks saved: {len(saved)}")
@@ -2,11 +2,14 @@
 Backtest using REAL historical data
 """
 
+import numpy as np
 import pandas as pd
 import sys
+from functools import lru_cache
 sys.path.append('..')
 
 from minimum_line_calculator import MinimumLineCalculator
+from config import CONFIDENCE_THRESHOLD
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -51,51 +54,63 @@ class RealBacktester:
         # Load current season averages (simplified)
         stats = self.load_historical_averages(None)
         
+        # Normalize first/last names on both frames and resolve every
+        # match with a single hashed merge instead of per-row lookups
+        stat_names = (
+            stats['Player'].fillna('').str.replace('.', '', regex=False)
+            .str.lower().str.split()
+        )
+        stats = stats.assign(
+            first_name=stat_names.str[0],
+            last_name=stat_names.str[-1]
+        ).drop_duplicates(subset=['first_name', 'last_name'], keep='first')
+
+        result_names = (
+            results['player_name'].fillna('').str.replace('.', '', regex=False)
+            .str.lower().str.split()
+        )
+        results = results.assign(
+            first_name=result_names.str[0],
+            last_name=result_names.str[-1]
+        )
+
+        joined = results.merge(
+            stats[['first_name', 'last_name', 'PTS', 'TRB', 'AST']],
+            on=['first_name', 'last_name'],
+            how='inner'
+        )
+
+        # The calculator's inputs are fully determined by the season
+        # average here, and players repeat across dates, so memoize
+        @lru_cache(maxsize=4096)
+        def cached_minimum(pra_avg):
+            player_stats_dict = {
+                'pts_reb_ast_avg': pra_avg,
+                'last_5_avg': pra_avg,
+                'consistency': 0.85
+            }
+            return self.calc.calculate_realistic_minimum(
+                player_stats_dict, pra_avg
+            )
+
         predictions = []
-        
-        for _, result in results.iterrows():
-            player_name = result['player_name']
-            actual_pra = result['pra']
-            date = result['date']
-            
-            # Find player in stats
-            player_parts = player_name.split()
-            if len(player_parts) < 2:
-                continue
-            
-            first_name = player_parts[0]
-            last_name = player_parts[-1]
-            
-            player_stats = stats[
-                (stats['Player'].str.contains(first_name, case=False, na=False)) &
-                (stats['Player'].str.contains(last_name, case=False, na=False))
-            ]
-            
-            if player_stats.empty:
-                continue
-            
-            player = player_stats.iloc[0]
+
+        for result in joined.itertuples(index=False):
+            player_name = result.player_name
+            actual_pra = result.pra
+            date = result.date
             
             # Calculate season average
-            pts_avg = player.get('PTS', 0)
-            reb_avg = player.get('TRB', 0)
-            ast_avg = player.get('AST', 0)
+            pts_avg = result.PTS
+            reb_avg = result.TRB
+            ast_avg = result.AST
             pra_avg = pts_avg + reb_avg + ast_avg
             
             if pra_avg < 5.0:
                 continue
             
-            # Calculate our recommended minimum
-            player_stats_dict = {
-                'pts_reb_ast_avg': pra_avg,
-                'last_5_avg': pra_avg,
-                'consistency': 0.85
-            }
-            
             # Use player's average as the "line"
-            min_line, confidence, reasoning = self.calc.calculate_realistic_minimum(
-                player_stats_dict, pra_avg
-            )
+            min_line, confidence, reasoning = cached_minimum(round(pra_avg, 2))
             
             if min_line is None:
                 continue
@@ -110,8 +125,7 @@ class RealBacktester:
                 'recommended_minimum': min_line,
                 'actual_pra': actual_pra,
                 'hit': hit,
-                'confidence': confidence,
-                'meets_90_threshold': confidence >= 0.90
+                'confidence': confidence
             })
         
         # Create results DataFrame
@@ -120,16 +134,25 @@ class RealBacktester:
         if results_df.empty:
             logger.info("\nNo predictions to analyze")
             return
+
+        # Flag high-confidence picks once, stored compactly as int8
+        results_df['meets_90_threshold'] = (
+            results_df['confidence'] >= CONFIDENCE_THRESHOLD
+        ).astype(np.int8)
+        results_df['hit'] = results_df['hit'].astype(np.int8)
         
+        hit_mask = results_df['hit'].astype(bool)
+        conf_mask = results_df['meets_90_threshold'].astype(bool)
+
         # Calculate overall win rate
         total = len(results_df)
-        wins = len(results_df[results_df['hit']])
+        wins = int(hit_mask.sum())
         win_rate = (wins / total) * 100 if total > 0 else 0
-        
+
         # Calculate win rate for 90%+ confidence picks
-        high_conf = results_df[results_df['meets_90_threshold']]
+        high_conf = results_df[conf_mask]
         if not high_conf.empty:
-            high_conf_wins = len(high_conf[high_conf['hit']])
+            high_conf_wins = int((hit_mask & conf_mask).sum())
             high_conf_total = len(high_conf)
             high_conf_rate = (high_conf_wins / high_conf_total) * 100
         else:
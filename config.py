@@ -22,6 +22,15 @@ ODDS_DATA_CSV = os.path.join(CSV_DIR, "odds_data.csv")
 PREDICTIONS_CSV = os.path.join(CSV_DIR, "predictions.csv")
 BACKTEST_RESULTS_CSV = os.path.join(CSV_DIR, "backtest_results.csv")
 GAME_RESULTS_CSV = os.path.join(CSV_DIR, "game_results.csv")
+SCHEDULE_CSV = os.path.join(CSV_DIR, "schedule.csv")
+
+# Parquet copies used for internal reads (CSV stays as the user-facing
+# export format)
+PREDICTIONS_PARQUET = PREDICTIONS_CSV.replace(".csv", ".parquet")
+PLAYER_STATS_PARQUET = PLAYER_STATS_CSV.replace(".csv", ".parquet")
+
+# Append-only odds store, partitioned by fetch date
+ODDS_DATA_PARQUET = os.path.join(CSV_DIR, "odds_data_parquet")
 
 # Scraping Configuration
 NBA_STATS_URL = "https://www.basketball-reference.com"
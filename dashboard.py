@@ -2,21 +2,20 @@
 Interactive web dashboard for NBA Prop Predictor
 """
 
-from flask import Flask, render_template, jsonify
-import subprocess
-import sys
-from flask import render_template, jsonify
+from flask import Flask, render_template, jsonify, send_from_directory
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import json
 from datetime import datetime
 import os
-from config import PREDICTIONS_CSV, CSV_DIR
+from config import PREDICTIONS_CSV, PREDICTIONS_PARQUET, CSV_DIR
 from results_tracker import ResultsTracker
 
 app = Flask(__name__)
 
 RECORD_FILE = os.path.join(CSV_DIR, 'overall_record.json')
 CONSISTENCY_FILE = os.path.join(CSV_DIR, 'player_consistency.csv')
+CACHE_JSON = os.path.join(CSV_DIR, '_cache.json')
 
 
 def load_player_consistency():
@@ -24,12 +23,12 @@ def load_player_consistency():
     try:
         df = pd.read_csv(CONSISTENCY_FILE)
         consistency = {}
-        for _, row in df.iterrows():
-            consistency[row['player_name']] = {
-                'wins': int(row['wins']),
-                'losses': int(row['losses']),
-                'win_pct': float(row['win_pct']),
-                'tier': row['tier']
+        for row in df.itertuples(index=False):
+            consistency[row.player_name] = {
+                'wins': int(row.wins),
+                'losses': int(row.losses),
+                'win_pct': float(row.win_pct),
+                'tier': row.tier
             }
         print(f"Loaded consistency data for {len(consistency)} players")
         return consistency
@@ -81,41 +80,60 @@ def get_record():
         return {'wins': 0, 'losses': 0, 'win_percentage': 0.0, 'total': 0}
 
 
+# Rebuilding the grouped payload is only needed when the predictions
+# file actually changes, so cache it keyed by the CSV mtime
+_predictions_cache = {'mtime': None, 'games': None}
+
+
 def get_predictions():
     """Get current predictions grouped by game"""
     try:
-        df = pd.read_csv(PREDICTIONS_CSV)
-        
+        # Prefer the Parquet copy; fall back to CSV for older data
+        if os.path.exists(PREDICTIONS_PARQUET):
+            path = PREDICTIONS_PARQUET
+        else:
+            path = PREDICTIONS_CSV
+
+        mtime = os.path.getmtime(path)
+        if mtime == _predictions_cache['mtime']:
+            return _predictions_cache['games']
+
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path)
+
+        # Fill optional columns and derive pick metrics once, vectorized
+        if 'team' not in df.columns:
+            df['team'] = 'Unknown'
+        if 'has_dk_line' not in df.columns:
+            df['has_dk_line'] = True
+        if 'meets_threshold' not in df.columns:
+            df['meets_threshold'] = False
+
+        df['cushion'] = df['season_avg'] - df['recommended_minimum']
+        df['below_dk'] = df['dk_line'] - df['recommended_minimum']
+
+        pick_columns = [
+            'player_name', 'team', 'dk_line', 'has_dk_line', 'meets_threshold',
+            'recommended_minimum', 'season_avg', 'pts_avg', 'reb_avg', 'ast_avg',
+            'confidence', 'reasoning', 'cushion', 'below_dk'
+        ]
+
         # Group by game
         games = []
-        for game in df['game'].unique():
-            game_picks = df[df['game'] == game]
-            
-            picks = []
-            for _, row in game_picks.iterrows():
-                player_name = row['player_name']
-                
-                # Get consistency data for this player
-                consistency = get_player_consistency(player_name, PLAYER_CONSISTENCY)
-                
-                picks.append({
-                    'player_name': player_name,
-                    'team': row.get('team', 'Unknown'),
-                    'dk_line': float(row['dk_line']),
-                    'has_dk_line': bool(row.get('has_dk_line', True)),
-                    'meets_threshold': bool(row.get('meets_threshold', False)),
-                    'recommended_minimum': float(row['recommended_minimum']),
-                    'season_avg': float(row['season_avg']),
-                    'pts_avg': float(row['pts_avg']),
-                    'reb_avg': float(row['reb_avg']),
-                    'ast_avg': float(row['ast_avg']),
-                    'confidence': float(row['confidence']),
-                    'reasoning': row['reasoning'],
-                    'cushion': float(row['season_avg'] - row['recommended_minimum']),
-                    'below_dk': float(row['dk_line'] - row['recommended_minimum']),
-                    'consistency': consistency  # Add consistency data
-                })
-            
+        for game, game_picks in df.groupby('game', sort=False):
+            picks = game_picks[pick_columns].to_dict(orient='records')
+
+            for pick in picks:
+                # jsonify needs plain bools, and each pick gets its
+                # consistency record attached
+                pick['has_dk_line'] = bool(pick['has_dk_line'])
+                pick['meets_threshold'] = bool(pick['meets_threshold'])
+                pick['consistency'] = get_player_consistency(
+                    pick['player_name'], PLAYER_CONSISTENCY
+                )
+
             # Parse game time
             game_time = game_picks.iloc[0]['game_time']
             try:
@@ -125,19 +143,24 @@ def get_predictions():
             except:
                 formatted_time = 'TBD'
                 formatted_date = 'TBD'
-            
+
             games.append({
                 'game': game,
                 'time': formatted_time,
                 'date': formatted_date,
                 'picks': picks,
                 'pick_count': len(picks),
-                'avg_confidence': sum(p['confidence'] for p in picks) / len(picks)
+                'avg_confidence': float(game_picks['confidence'].mean())
             })
-        
-        return sorted(games, key=lambda x: x['date'])
-        
-    except FileNotFoundError:
+
+        games = sorted(games, key=lambda x: x['date'])
+
+        _predictions_cache['mtime'] = mtime
+        _predictions_cache['games'] = games
+
+        return games
+
+    except (FileNotFoundError, OSError):
         return []
 
 
@@ -157,32 +180,84 @@ def index():
                          avg_confidence=avg_confidence)
 
 
-@app.route('/api/refresh')
-def refresh():
-    """API endpoint to refresh data"""
+# The API payload is materialized to disk so repeat polls can be
+# answered with 304 Not Modified instead of a rebuilt response body
+_cache_json_state = {'mtime': None}
+
+
+def _rebuild_cache_json():
+    """Rewrite the JSON artifact only when the predictions data changed"""
+    try:
+        path = PREDICTIONS_PARQUET if os.path.exists(PREDICTIONS_PARQUET) else PREDICTIONS_CSV
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    if mtime == _cache_json_state['mtime'] and os.path.exists(CACHE_JSON):
+        return
+
     record = get_record()
     games = get_predictions()
     total_picks = sum(g['pick_count'] for g in games)
-    
-    return jsonify({
-        'record': record,
-        'games': games,
-        'total_picks': total_picks
-    })
+
+    with open(CACHE_JSON, 'w') as f:
+        json.dump({
+            'record': record,
+            'games': games,
+            'total_picks': total_picks
+        }, f)
+
+    _cache_json_state['mtime'] = mtime
+
+
+@app.route('/api/refresh')
+def refresh():
+    """API endpoint to refresh data"""
+    _rebuild_cache_json()
+    # Flask handles ETag / If-None-Match for us here
+    return send_from_directory(CSV_DIR, '_cache.json', max_age=5, conditional=True)
+
+
+# One worker: a single generation runs at a time, in-process, with no
+# interpreter start or pandas/sklearn re-import per request
+_generate_executor = ThreadPoolExecutor(max_workers=1)
+_generate_future = None
+
+
+def _run_generation():
+    """Update data and regenerate predictions in-process"""
+    from main import NBAPropSystem
+
+    system = NBAPropSystem()
+    system.update_data()
+    system.make_predictions()
 
 
 @app.route('/generate')
 def generate_predictions():
-    """Generate fresh predictions"""
-    try:
-        # Run update and predict
-        subprocess.run([sys.executable, 'main.py', 'update'], check=True, timeout=120)
-        subprocess.run([sys.executable, 'main.py', 'predict'], check=True, timeout=60)
+    """Kick off prediction generation in the background worker"""
+    global _generate_future
+
+    if _generate_future is not None and not _generate_future.done():
+        return {'status': 'running', 'message': 'Generation already in progress'}
+
+    _generate_future = _generate_executor.submit(_run_generation)
+    return {'status': 'started', 'message': 'Prediction generation started'}
+
+
+@app.route('/generate/status')
+def generate_status():
+    """Poll the background generation job"""
+    if _generate_future is None:
+        return {'status': 'idle'}
+
+    if _generate_future.done():
+        exc = _generate_future.exception()
+        if exc is not None:
+            return {'status': 'error', 'message': str(exc)}, 500
         return {'status': 'success', 'message': 'Predictions generated!'}
-    except subprocess.TimeoutExpired:
-        return {'status': 'error', 'message': 'Timeout - this takes a while on Render'}, 500
-    except Exception as e:
-        return {'status': 'error', 'message': str(e)}, 500
+
+    return {'status': 'running'}
 
 
 if __name__ == '__main__':
@@ -4,8 +4,11 @@ Scrape actual game results - FIXED VERSION using table IDs
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from lxml import html
+from rapidfuzz import fuzz, process
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import logging
 from config import CSV_DIR, PREDICTIONS_CSV
@@ -16,6 +19,29 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 GAME_RESULTS_CSV = os.path.join(CSV_DIR, 'game_results.csv')
+# Date-partitioned Parquet dataset; readers can load a single day
+# without parsing the whole CSV history
+GAME_RESULTS_PARQUET = os.path.join(CSV_DIR, 'game_results_parquet')
+
+MAX_SCRAPE_WORKERS = 4
+REQUEST_INTERVAL = 3.0  # one request per interval, shared across threads
+
+
+class _RateLimiter:
+    """Token-bucket limiter shared by the fetch threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
 
 
 class GameResultsScraper:
@@ -24,7 +50,14 @@ class GameResultsScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # One keep-alive session for every box score fetch instead of a
+        # fresh TCP/TLS handshake per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
         self.tracker = ResultsTracker()
+        self.limiter = _RateLimiter(REQUEST_INTERVAL)
+        # Known (date, player) keys, loaded lazily for append-time dedupe
+        self._seen_keys = None
     
     def scrape_games_for_date(self, date):
         """Scrape box scores for all games on a specific date"""
@@ -36,30 +69,30 @@ class GameResultsScraper:
         logger.info(f"Scraping games for {date.strftime('%Y-%m-%d')}")
         
         try:
-            response = requests.get(url, headers=self.headers)
+            self.limiter.wait()
+            response = self.session.get(url)
             response.raise_for_status()
-            time.sleep(3)
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            game_summaries = soup.find_all('div', {'class': 'game_summary'})
-            
-            if not game_summaries:
+
+            tree = html.fromstring(response.content)
+            box_links = tree.xpath(
+                '//div[contains(@class, "game_summary")]//a[text()="Box Score"]/@href'
+            )
+
+            if not box_links:
                 logger.warning(f"No games found for {date.strftime('%Y-%m-%d')}")
                 return []
-            
+
+            urls = [self.base_url + href for href in box_links]
+
             all_player_stats = []
-            
-            for game in game_summaries:
-                box_score_link = game.find('a', string='Box Score')
-                if not box_score_link:
-                    continue
-                
-                box_score_url = self.base_url + box_score_link['href']
-                player_stats = self.scrape_box_score(box_score_url, date)
-                if player_stats:
-                    all_player_stats.extend(player_stats)
-                
-                time.sleep(3)
+
+            # Overlap the per-game network waits; the shared limiter
+            # keeps the overall request rate unchanged
+            with ThreadPoolExecutor(max_workers=MAX_SCRAPE_WORKERS) as pool:
+                for player_stats in pool.map(
+                        lambda u: self.scrape_box_score(u, date), urls):
+                    if player_stats:
+                        all_player_stats.extend(player_stats)
             
             logger.info(f"Scraped {len(all_player_stats)} player performances")
             self.save_game_results(all_player_stats)
@@ -70,69 +103,75 @@ class GameResultsScraper:
             logger.error(f"Error scraping games: {e}")
             return []
     
+    @staticmethod
+    def _stat_text(row, stat, header=False):
+        """Text content of the cell with the given data-stat, or ''"""
+        tag = 'th' if header else 'td'
+        texts = row.xpath(f'.//{tag}[@data-stat="{stat}"]//text()')
+        return texts[0].strip() if texts else ''
+
     def scrape_box_score(self, url, date):
         """Scrape box score using specific table IDs"""
         try:
-            response = requests.get(url, headers=self.headers)
+            self.limiter.wait()
+            response = self.session.get(url)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            
+
+            tree = html.fromstring(response.content)
+
             player_stats = []
-            
+
             # Basketball Reference uses specific IDs for basic box scores
             # box-TEAMABBR-game-basic for each team
             # Find all tables with IDs ending in '-game-basic'
-            basic_tables = soup.find_all('table', id=lambda x: x and x.endswith('-game-basic'))
-            
+            basic_tables = tree.xpath(
+                "//table[substring(@id, string-length(@id) - 10) = '-game-basic']"
+            )
+
             for table in basic_tables:
-                df = pd.read_html(str(table))[0]
-                
-                # Handle multi-level columns
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = df.columns.droplevel(0)
-                
-                # Get player column (first column)
-                player_col = df.columns[0]
-                
-                for _, row in df.iterrows():
-                    try:
-                        player_name = str(row[player_col])
-                        
-                        # Skip headers, totals, reserves
-                        skip_terms = ['Player', 'Reserves', 'Team Totals', 'Starters']
-                        if any(term in player_name for term in skip_terms):
-                            continue
-                        
-                        if pd.isna(player_name) or player_name == '':
-                            continue
-                        
-                        # Get stats
-                        pts = float(row.get('PTS', 0) or 0)
-                        reb = float(row.get('TRB', 0) or 0)
-                        ast = float(row.get('AST', 0) or 0)
-                        pra = pts + reb + ast
-                        mp = str(row.get('MP', '0:00'))
-                        
-                        # Skip DNP
-                        if 'Did Not' in mp or 'Not With Team' in mp:
-                            continue
-                        
-                        # Skip 0 minutes
-                        if mp in ['0:00', '0', 'NaN'] or pd.isna(mp):
-                            continue
-                        
-                        player_stats.append({
-                            'date': date.strftime('%Y-%m-%d'),
-                            'player_name': player_name,
-                            'pts': pts,
-                            'reb': reb,
-                            'ast': ast,
-                            'pra': pra,
-                            'mp': mp
-                        })
-                    except (ValueError, TypeError, KeyError):
-                        continue
+                # Every cell carries its stat name as data-stat, so rows
+                # parse directly without a pd.read_html round-trip
+                rows = table.xpath('.//tbody/tr[not(contains(@class, "thead"))]')
+
+                if not rows:
+                    continue
+
+                # Collect raw cells first; all skip logic then runs as
+                # vectorized masks instead of per-row string checks
+                df = pd.DataFrame({
+                    'player_name': [self._stat_text(r, 'player', header=True) for r in rows],
+                    'mp': [self._stat_text(r, 'mp') for r in rows],
+                    'pts': [self._stat_text(r, 'pts') for r in rows],
+                    'reb': [self._stat_text(r, 'trb') for r in rows],
+                    'ast': [self._stat_text(r, 'ast') for r in rows]
+                })
+
+                # Skip headers, totals, reserves
+                bad = df['player_name'].isin(
+                    {'', 'Player', 'Reserves', 'Team Totals', 'Starters'}
+                )
+
+                # Skip DNP and 0-minute rows
+                dnp = (
+                    df['mp'].str.contains('Did Not', regex=False)
+                    | df['mp'].str.contains('Not With Team', regex=False)
+                    | df['mp'].isin({'', '0:00', '0', 'NaN'})
+                )
+
+                df = df[~(bad | dnp)].copy()
+
+                if df.empty:
+                    continue
+
+                for col in ('pts', 'reb', 'ast'):
+                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+                df['pra'] = df['pts'] + df['reb'] + df['ast']
+                df['date'] = date.strftime('%Y-%m-%d')
+
+                player_stats.extend(
+                    df[['date', 'player_name', 'pts', 'reb', 'ast', 'pra', 'mp']]
+                    .to_dict('records')
+                )
             
             return player_stats
             
@@ -141,18 +180,60 @@ class GameResultsScraper:
             return []
     
     def save_game_results(self, results):
-        """Save game results to CSV"""
-        try:
-            existing_df = pd.read_csv(GAME_RESULTS_CSV)
-        except FileNotFoundError:
-            existing_df = pd.DataFrame()
-        
+        """Append new game results to CSV without rewriting history"""
+        if not results:
+            return
+
         new_df = pd.DataFrame(results)
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        combined_df = combined_df.drop_duplicates(subset=['date', 'player_name'], keep='last')
-        combined_df.to_csv(GAME_RESULTS_CSV, index=False)
-        logger.info(f"Saved {len(results)} game results to {GAME_RESULTS_CSV}")
+
+        # Dedupe against a key set loaded once, instead of reading and
+        # rewriting the whole file on every save
+        if self._seen_keys is None:
+            try:
+                existing = pd.read_csv(GAME_RESULTS_CSV, usecols=['date', 'player_name'])
+                self._seen_keys = set(zip(existing['date'], existing['player_name']))
+            except FileNotFoundError:
+                self._seen_keys = set()
+
+        keys = list(zip(new_df['date'], new_df['player_name']))
+        keep = [key not in self._seen_keys for key in keys]
+        new_df = new_df[keep]
+
+        if new_df.empty:
+            logger.info("No new game results to save")
+            return
+
+        self._seen_keys.update(key for key, k in zip(keys, keep) if k)
+
+        # Parquet partitioned by date for readers; CSV kept as the
+        # compatibility export
+        new_df.to_parquet(GAME_RESULTS_PARQUET, partition_cols=['date'], engine='pyarrow')
+        new_df.to_csv(
+            GAME_RESULTS_CSV, mode='a',
+            header=not os.path.exists(GAME_RESULTS_CSV), index=False
+        )
+        logger.info(f"Saved {len(new_df)} game results to {GAME_RESULTS_CSV}")
     
+    def compact_game_results(self):
+        """Explicit maintenance pass: dedupe and rewrite the results CSV
+
+        Appends no longer rewrite history, so the occasional duplicate
+        (e.g. a re-scraped date from before the key set existed) is
+        cleaned up here instead of on every save.
+        """
+        try:
+            df = pd.read_csv(GAME_RESULTS_CSV)
+        except FileNotFoundError:
+            logger.info("No game results to compact")
+            return
+
+        before = len(df)
+        df = df.drop_duplicates(subset=['date', 'player_name'], keep='last')
+        df.to_csv(GAME_RESULTS_CSV, index=False)
+        self._seen_keys = set(zip(df['date'], df['player_name']))
+
+        logger.info(f"Compacted game results: {before} -> {len(df)} rows")
+
     def auto_mark_predictions(self, date):
         """Automatically compare predictions with actual results"""
         logger.info(f"Auto-marking predictions for {date}")
@@ -170,9 +251,22 @@ class GameResultsScraper:
             logger.info(f"Using dated predictions: {dated_file}")
         
         try:
-            results_df = pd.read_csv(GAME_RESULTS_CSV)
-            results_df = results_df[results_df['date'] == date]
-        except FileNotFoundError:
+            if os.path.isdir(GAME_RESULTS_PARQUET):
+                # Only the requested date partition is read from disk
+                results_df = pd.read_parquet(
+                    GAME_RESULTS_PARQUET,
+                    columns=['date', 'player_name', 'pra'],
+                    filters=[('date', '=', date)]
+                )
+                results_df['date'] = results_df['date'].astype(str)
+            else:
+                results_df = pd.read_csv(
+                    GAME_RESULTS_CSV,
+                    usecols=['date', 'player_name', 'pra'],
+                    dtype={'date': 'string', 'player_name': 'string', 'pra': 'float32'}
+                )
+                results_df = results_df[results_df['date'] == date]
+        except (FileNotFoundError, OSError):
             logger.error("No game results found")
             return
         
@@ -180,40 +274,47 @@ class GameResultsScraper:
             logger.warning(f"No results found for {date}")
             return
         
+        # Score every prediction against every result name in one
+        # vectorized C call, then pick the best match per prediction.
+        # Names are normalized once up front and processor=None tells
+        # RapidFuzz to skip its own per-string preprocessing.
+        results_df = results_df.reset_index(drop=True)
+        pred_names = (
+            pred_df['player_name'].fillna('')
+            .str.replace('.', '', regex=False).str.strip().str.lower().tolist()
+        )
+        result_names = (
+            results_df['player_name'].fillna('')
+            .str.replace('.', '', regex=False).str.strip().str.lower().tolist()
+        )
+
+        # Exact matches (the common case) resolve with a dict lookup;
+        # only the misses pay for the fuzzy scoring pass
+        exact_index = {name: i for i, name in enumerate(result_names)}
+        matched_idx = [exact_index.get(name, -1) for name in pred_names]
+
+        fuzzy_rows = [i for i, m in enumerate(matched_idx) if m < 0]
+        if fuzzy_rows:
+            scores = process.cdist(
+                [pred_names[i] for i in fuzzy_rows], result_names,
+                scorer=fuzz.WRatio, processor=None, score_cutoff=85, workers=-1
+            )
+            for j, i in enumerate(fuzzy_rows):
+                # Below the cutoff, cdist leaves the score at 0
+                if scores[j].max() > 0:
+                    matched_idx[i] = int(scores[j].argmax())
+
         marked_count = 0
-        
-        for _, pred in pred_df.iterrows():
-            player_name = pred['player_name']
-            recommended_min = pred['recommended_minimum']
-            
-            # Match player - IMPROVED MATCHING LOGIC
-            # Normalize names (remove periods, extra spaces)
-            pred_name_norm = player_name.replace('.', '').strip()
-            
-            # Try exact match first
-            result = results_df[results_df['player_name'].str.replace('.', '').str.strip().str.lower() == pred_name_norm.lower()]
-            
-            # If no exact match, try last name match (more specific than first name)
-            if result.empty:
-                last_name = player_name.split()[-1].replace('.', '').replace('Jr', '').replace('III', '').replace('II', '').strip()
-                if last_name and len(last_name) > 2:  # Avoid matching on "Jr"
-                    result = results_df[results_df['player_name'].str.contains(last_name, case=False, na=False)]
-                    
-                    # If multiple matches, try to match first name too
-                    if len(result) > 1:
-                        first_name = player_name.split()[0]
-                        temp_result = result[result['player_name'].str.contains(first_name, case=False, na=False)]
-                        if not temp_result.empty:
-                            result = temp_result
-            
-            if result.empty:
+
+        for i, pred in enumerate(pred_df.itertuples(index=False)):
+            player_name = pred.player_name
+            recommended_min = pred.recommended_minimum
+
+            if matched_idx[i] < 0:
                 logger.info(f"No prediction found for {player_name} - skipping")
                 continue
-            
-            if len(result) > 1:
-                logger.warning(f"Multiple matches for {player_name}: {result['player_name'].tolist()} - using first")
-            
-            result = result.iloc[0]
+
+            result = results_df.iloc[matched_idx[i]]
             actual_pra = result['pra']
             
             # Skip DNP (voided by DK)
@@ -280,12 +381,15 @@ def main():
         print("\nUsage:")
         print("  python game_results_scraper.py yesterday")
         print("  python game_results_scraper.py date YYYY-MM-DD")
+        print("  python game_results_scraper.py compact")
         return
-    
+
     command = sys.argv[1].lower()
-    
+
     if command == 'yesterday':
         scraper.process_yesterday()
+    elif command == 'compact':
+        scraper.compact_game_results()
     elif command == 'date':
         if len(sys.argv) < 3:
             print("Usage: python game_results_scraper.py date YYYY-MM-DD")
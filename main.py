@@ -2,11 +2,13 @@
 Main orchestration script for NBA Prop Predictor System
 """
 
+import numpy as np
 import pandas as pd
 import logging
+import shutil
 from datetime import datetime
 import sys
-from config import PREDICTIONS_CSV, CONFIDENCE_THRESHOLD
+from config import PREDICTIONS_CSV, PREDICTIONS_PARQUET, CONFIDENCE_THRESHOLD
 from odds_fetcher import OddsAPIFetcher
 from stats_scraper import PlayerStatsScraper
 from ml_predictor import PropPredictor
@@ -19,6 +21,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Optional Polars fast path: the name-key join runs multithreaded in
+# Rust when polars is installed, with pandas as the fallback
+try:
+    import polars as pl
+    _HAS_POLARS = True
+except ImportError:
+    _HAS_POLARS = False
+
+
+def _join_odds_stats(odds_df, stats_df):
+    """Inner-join odds to stats on the normalized name keys"""
+    if _HAS_POLARS:
+        return (
+            pl.from_pandas(odds_df)
+            .join(pl.from_pandas(stats_df), on=['first_lc', 'last_lc'], how='inner')
+            .to_pandas()
+        )
+    return odds_df.merge(stats_df, on=['first_lc', 'last_lc'], how='inner')
+
+
+def _name_join_keys(names):
+    """Lowercased, accent-folded first/last name tokens for joining
+
+    NFKD + ascii-fold means 'Jokić' and 'Jokic' land on the same key,
+    which substring matching only got right by accident.
+    """
+    normalized = (
+        names.fillna('').str.normalize('NFKD')
+        .str.encode('ascii', 'ignore').str.decode('ascii')
+        .str.replace('.', '', regex=False).str.lower().str.split()
+    )
+    return normalized.str[0], normalized.str[-1]
+
 
 class NBAPropSystem:
     def __init__(self):
@@ -26,6 +61,8 @@ class NBAPropSystem:
         self.stats_scraper = PlayerStatsScraper()
         self.predictor = PropPredictor()
         self.backtester = Backtester()
+        self._stats_df = None
+        self._stats_mtime = None
         
     def update_data(self):
         """Update all data sources"""
@@ -92,6 +129,87 @@ class NBAPropSystem:
         
         return True
     
+    def _load_stats(self):
+        """Load player stats, re-reading only when the file changes
+
+        A missing file is detected with one stat call up front rather
+        than surfacing as an exception deep in the predict path.
+        """
+        import os
+        from config import PLAYER_STATS_CSV, PLAYER_STATS_PARQUET
+
+        if os.path.exists(PLAYER_STATS_PARQUET):
+            stats_path = PLAYER_STATS_PARQUET
+        else:
+            stats_path = PLAYER_STATS_CSV
+
+        try:
+            mtime = os.path.getmtime(stats_path)
+        except OSError:
+            return None
+
+        if self._stats_df is not None and mtime == self._stats_mtime:
+            return self._stats_df
+
+        try:
+            if os.path.exists(PLAYER_STATS_PARQUET):
+                stats_df = pd.read_parquet(
+                    PLAYER_STATS_PARQUET,
+                    columns=['Player', 'Team', 'PTS', 'TRB', 'AST']
+                )
+                # Arrow-backed strings: the name-key .str ops run as
+                # Arrow compute kernels instead of per-object Python
+                stats_df = stats_df.astype(
+                    {'Player': 'string[pyarrow]', 'Team': 'string[pyarrow]'}
+                )
+            else:
+                # Fixed schema: parse only the columns predictions use,
+                # with no per-column dtype inference
+                stats_df = pd.read_csv(
+                    PLAYER_STATS_CSV,
+                    usecols=['Player', 'Team', 'PTS', 'TRB', 'AST'],
+                    dtype={'Player': 'string[pyarrow]', 'Team': 'string[pyarrow]',
+                           'PTS': 'float32', 'TRB': 'float32', 'AST': 'float32'}
+                )
+        except FileNotFoundError:
+            return None
+
+        # Guarantee the columns downstream reads exist, once, so the
+        # prediction path uses plain column access with no per-row
+        # .get fallbacks
+        for col in ('PTS', 'TRB', 'AST'):
+            if col not in stats_df.columns:
+                stats_df[col] = 0.0
+        if 'Team' not in stats_df.columns:
+            stats_df['Team'] = 'Unknown'
+
+        # Precompute the PRA average and drop sub-rotation players once
+        # here, so each prediction run skips the add + filter
+        stats_df['pra_avg'] = (
+            stats_df['PTS'].fillna(0)
+            + stats_df['TRB'].fillna(0)
+            + stats_df['AST'].fillna(0)
+        )
+        stats_df = stats_df[stats_df['pra_avg'] >= 5.0]
+
+        # Derive the join keys here as well, and sort by them so the
+        # merge walks contiguous memory instead of hashing scattered
+        # rows; the hot path is bandwidth-bound, so narrow dtypes plus
+        # sorted contiguous keys is the lever that matters
+        stats_first, stats_last = _name_join_keys(stats_df['Player'])
+        stats_df = stats_df.assign(first_lc=stats_first, last_lc=stats_last)
+        stats_df = stats_df.drop_duplicates(subset=['first_lc', 'last_lc'], keep='first')
+        stats_df = stats_df.sort_values(['first_lc', 'last_lc'], ignore_index=True)
+
+        logger.debug(
+            "stats_df footprint: %d bytes for %d rows",
+            stats_df.memory_usage(deep=True).sum(), len(stats_df)
+        )
+
+        self._stats_df = stats_df
+        self._stats_mtime = mtime
+        return stats_df
+
     def make_predictions(self):
         """
         Generate predictions - SIMPLE VERSION
@@ -118,114 +236,95 @@ class NBAPropSystem:
         
         logger.info(f"Found {len(odds_df)} players with prop lines")
         
-        # 2. LOAD OUR PLAYER STATS
+        # 2. LOAD OUR PLAYER STATS (cached across prediction runs)
         logger.info("Loading player statistics...")
-        try:
-            from config import PLAYER_STATS_CSV
-            stats_df = pd.read_csv(PLAYER_STATS_CSV)
-        except FileNotFoundError:
+        stats_df = self._load_stats()
+        if stats_df is None:
             logger.error("Player stats not found")
             return None
         
         # 3. MATCH AND CALCULATE
         calc = MinimumLineCalculator()
-        predictions = []
-        
-        for _, odds_row in odds_df.iterrows():
-            player_name = odds_row['player_name']
-            dk_line = odds_row['line']
-            home_team = odds_row['home_team']
-            away_team = odds_row['away_team']
-            game_time = odds_row['commence_time']
-            
-            # Find player in our stats (match by first and last name)
-            player_parts = player_name.split()
-            if len(player_parts) < 2:
-                continue
-            
-            first_name = player_parts[0]
-            last_name = player_parts[-1]
-            
-            # Match player
-            player_stats = stats_df[
-                (stats_df['Player'].str.contains(first_name, case=False, na=False)) &
-                (stats_df['Player'].str.contains(last_name, case=False, na=False))
-            ]
-            
-            if player_stats.empty:
-                logger.warning(f"No stats found for {player_name}")
-                continue
-            
-            # Get the most recent stats for this player
-            player = player_stats.iloc[0]
-            
-            # Calculate PRA average
-            pts_avg = player.get('PTS', 0)
-            reb_avg = player.get('TRB', 0)
-            ast_avg = player.get('AST', 0)
-            pra_avg = pts_avg + reb_avg + ast_avg
-            
-            # Skip if no real production
-            if pra_avg < 5.0:
-                continue
-            
-            # Calculate minimum line using our system
-            player_stats_dict = {
-                'pts_reb_ast_avg': pra_avg,
-                'last_5_avg': pra_avg,
+
+        # Stats arrive with their join keys precomputed and sorted from
+        # _load_stats; only the odds side needs normalizing here
+        odds_first, odds_last = _name_join_keys(odds_df['player_name'])
+        odds_df = odds_df.assign(
+            first_lc=odds_first,
+            last_lc=odds_last
+        )
+
+        # pra_avg and the production filter already live on stats_df
+        merged = _join_odds_stats(odds_df, stats_df)
+
+        if merged.empty:
+            logger.info("No predictions generated")
+            return None
+
+        # Dedupe before the calculator runs so duplicate odds rows
+        # don't pay for a computation that gets dropped at the end.
+        # The team columns arrive as categoricals from the odds store,
+        # which don't support +, so concat on string views.
+        merged['game'] = (
+            merged['away_team'].astype(str) + ' @ ' + merged['home_team'].astype(str)
+        )
+        merged = merged.drop_duplicates(subset=['player_name', 'game'], keep='first')
+
+        # One batched minimum-line calculation over the whole frame
+        min_arr, conf_arr, reason_arr = calc.calculate_realistic_minimum_batch(
+            {
+                'pts_reb_ast_avg': merged['pra_avg'].to_numpy(),
+                'last_5_avg': merged['pra_avg'].to_numpy(),
                 'consistency': 0.85
-            }
-            
-            min_line, confidence, reasoning = calc.calculate_realistic_minimum(
-                player_stats_dict, dk_line
-            )
-            
-            if min_line is None:
-                continue
-            
-            meets_threshold = confidence >= 0.90
-            
-            predictions.append({
-                'player_name': player_name,
-                'team': player.get('Team', 'Unknown'),
-                'dk_line': dk_line,
-                'has_dk_line': True,
-                'recommended_minimum': min_line,
-                'season_avg': pra_avg,
-                'pts_avg': pts_avg,
-                'reb_avg': reb_avg,
-                'ast_avg': ast_avg,
-                'confidence': confidence,
-                'meets_threshold': meets_threshold,
-                'reasoning': reasoning,
-                'home_team': home_team,
-                'away_team': away_team,
-                'game': f"{away_team} @ {home_team}",
-                'game_time': game_time,
-                'timestamp': datetime.now().isoformat()
-            })
-        
-        if not predictions:
+            },
+            merged['line'].to_numpy()
+        )
+
+        merged['recommended_minimum'] = min_arr
+        merged['confidence'] = conf_arr
+        merged['reasoning'] = reason_arr
+        merged = merged[merged['recommended_minimum'].notna()]
+
+        if merged.empty:
             logger.info("No predictions generated")
             return None
-        
-        # Create DataFrame
-        pred_df = pd.DataFrame(predictions)
-        
-        # Remove duplicates
-        pred_df = pred_df.drop_duplicates(subset=['player_name', 'game'], keep='first')
+
+        # Keep merged as the backbone: rename and trim columns in place
+        # instead of materializing a second frame
+        pred_df = merged.rename(columns={
+            'Team': 'team',
+            'line': 'dk_line',
+            'pra_avg': 'season_avg',
+            'PTS': 'pts_avg',
+            'TRB': 'reb_avg',
+            'AST': 'ast_avg',
+            'commence_time': 'game_time'
+        })
+        pred_df['has_dk_line'] = True
+        pred_df['meets_threshold'] = pred_df['confidence'] >= 0.90
+        pred_df['timestamp'] = datetime.now().isoformat()
+
+        pred_df = pred_df[[
+            'player_name', 'team', 'dk_line', 'has_dk_line',
+            'recommended_minimum', 'season_avg', 'pts_avg', 'reb_avg',
+            'ast_avg', 'confidence', 'meets_threshold', 'reasoning',
+            'home_team', 'away_team', 'game', 'game_time', 'timestamp'
+        ]]
         
         # Sort by game, then by confidence
         pred_df = pred_df.sort_values(['game', 'confidence'], ascending=[True, False])
         
         # Save
-        # Save to main predictions file
+        # Parquet for internal readers (faster, dtype-preserving),
+        # CSV as the user-facing copy
+        pred_df.to_parquet(PREDICTIONS_PARQUET, compression='zstd', engine='pyarrow')
         pred_df.to_csv(PREDICTIONS_CSV, index=False)
         
-        # Also save dated copy for historical tracking
+        # Also save dated copy for historical tracking - a file copy
+        # skips the second cell-formatting pass over the whole frame
         date_str = datetime.now().strftime('%Y-%m-%d')
         dated_file = PREDICTIONS_CSV.replace('.csv', f'_{date_str}.csv')
-        pred_df.to_csv(dated_file, index=False)
+        shutil.copyfile(PREDICTIONS_CSV, dated_file)
         logger.info(f"Also saved to {dated_file}")
         
         high_conf = len(pred_df[pred_df['meets_threshold']])
@@ -293,68 +392,85 @@ class NBAPropSystem:
         print(f"📊 TOTAL PLAYERS ANALYZED: {total}")
         print()
         
-        # Group by game
-        games = pred_df['game'].unique()
-        
-        for game in games:
-            game_picks = pred_df[pred_df['game'] == game]
-            high_conf_count = len(game_picks[game_picks['meets_threshold']])
+        # Pre-format every pick's text block in a few vectorized passes
+        # instead of ~10 f-strings per row inside the loop
+        icon = pd.Series(
+            np.where(pred_df['meets_threshold'],
+                     '🎯 HIGH CONFIDENCE', '⚠️  LOWER CONFIDENCE'),
+            index=pred_df.index
+        )
+        line_str = pred_df['dk_line'].round(1).astype(str)
+        season_str = pred_df['season_avg'].round(1).astype(str)
+        pts_str = pred_df['pts_avg'].round(1).astype(str)
+        reb_str = pred_df['reb_avg'].round(1).astype(str)
+        ast_str = pred_df['ast_avg'].round(1).astype(str)
+        rec_str = pred_df['recommended_minimum'].round(1).astype(str)
+        conf_str = (pred_df['confidence'] * 100).round(1).astype(str) + '%'
+        cushion_str = (pred_df['season_avg'] - pred_df['recommended_minimum']).round(1).astype(str)
+        below_dk_str = (pred_df['dk_line'] - pred_df['recommended_minimum']).round(1).astype(str)
+
+        line_block = pd.Series(
+            np.where(pred_df['has_dk_line'],
+                     '  DraftKings Line: ' + line_str + ' PRA O/U',
+                     '  ⚠️  NO DK LINE AVAILABLE (prediction based on season avg)'),
+            index=pred_df.index
+        )
+        dk_cushion_block = pd.Series(
+            np.where(pred_df['has_dk_line'],
+                     '\n  ✓ ' + below_dk_str + ' pts below DraftKings line',
+                     ''),
+            index=pred_df.index
+        )
+
+        # player_name arrives categorical from the odds store and the
+        # team column can be Arrow-backed; concat on string views
+        pick_blocks = (
+            icon + ' | ' + pred_df['player_name'].astype(str)
+            + ' (' + pred_df['team'].astype(str) + ')\n'
+            + line_block + '\n'
+            + '  Season Average: ' + season_str + ' PRA ('
+            + pts_str + ' PTS / ' + reb_str + ' REB / ' + ast_str + ' AST)\n\n'
+            + '  🎯 RECOMMENDED MINIMUM: ' + rec_str + ' PRA\n'
+            + '  📊 Confidence: ' + conf_str + '\n'
+            + '  �� ' + pred_df['reasoning'] + '\n\n'
+            + '  ✓ ' + cushion_str + ' pts below season average'
+            + dk_cushion_block + '\n\n'
+            + '-' * 80 + '\n'
+        )
+
+        # Parse and format every game time in one vectorized pass; rows
+        # that don't parse fall back to the raw string
+        game_dt = pd.to_datetime(
+            pred_df['game_time'].astype(str).str.replace('Z', '+00:00', regex=False),
+            errors='coerce', utc=True
+        )
+        time_labels = game_dt.dt.strftime('%I:%M %p ET on %B %d, %Y')
+        time_labels = time_labels.fillna(pred_df['game_time'].astype(str))
+
+        # Group by game in one pass; per-game high-confidence counts
+        # come from a single groupby sum
+        high_conf_counts = pred_df.groupby('game', sort=False)['meets_threshold'].sum()
+
+        for game, game_picks in pred_df.groupby('game', sort=False):
+            high_conf_count = int(high_conf_counts[game])
             
             print("━" * 80)
             print(f"GAME: {game}")
             game_time = game_picks.iloc[0]['game_time']
             if game_time and game_time != 'TBD':
-                from datetime import datetime
-                try:
-                    dt = datetime.fromisoformat(game_time.replace('Z', '+00:00'))
-                    print(f"Time: {dt.strftime('%I:%M %p ET on %B %d, %Y')}")
-                except:
-                    print(f"Time: {game_time}")
+                print(f"Time: {time_labels.loc[game_picks.index[0]]}")
             print(f"Players: {len(game_picks)} | High Confidence: {high_conf_count}")
             print("━" * 80)
             print()
             
-            for idx, row in game_picks.iterrows():
-                # Show confidence indicator
-                if row['meets_threshold']:
-                    conf_icon = "🎯 HIGH CONFIDENCE"
-                    color = ""
-                else:
-                    conf_icon = "⚠️  LOWER CONFIDENCE"
-                    color = ""
-                
-                print(f"{conf_icon} | {row['player_name']} ({row['team']})")
-                
-                # Show if line exists
-                if row['has_dk_line']:
-                    print(f"  DraftKings Line: {row['dk_line']:.1f} PRA O/U")
-                else:
-                    print(f"  ⚠️  NO DK LINE AVAILABLE (prediction based on season avg)")
-                
-                print(f"  Season Average: {row['season_avg']:.1f} PRA ({row['pts_avg']:.1f} PTS / {row['reb_avg']:.1f} REB / {row['ast_avg']:.1f} AST)")
-                print()
-                print(f"  🎯 RECOMMENDED MINIMUM: {row['recommended_minimum']:.1f} PRA")
-                print(f"  📊 Confidence: {row['confidence']:.1%}")
-                print(f"  �� {row['reasoning']}")
-                print()
-                
-                # Show the advantage
-                cushion = row['season_avg'] - row['recommended_minimum']
-                below_dk = row['dk_line'] - row['recommended_minimum']
-                print(f"  ✓ {cushion:.1f} pts below season average")
-                
-                if row['has_dk_line']:
-                    print(f"  ✓ {below_dk:.1f} pts below DraftKings line")
-                
-                print()
-                print("-" * 80)
-                print()
+            # One write per game from the pre-built blocks
+            print('\n'.join(pick_blocks.loc[game_picks.index]))
         
         print("=" * 80)
         print(f"Total Players: {len(pred_df)}")
         print(f"High Confidence (90%+): {high_conf}")
         print(f"Average Confidence: {pred_df['confidence'].mean():.1%}")
-        print(f"Games Covered: {len(games)}")
+        print(f"Games Covered: {pred_df['game'].nunique()}")
         print()
         print("💡 TIP: Focus on HIGH CONFIDENCE picks for best results")
         print("   Lower confidence picks shown for reference/comparison")
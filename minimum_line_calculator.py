@@ -9,6 +9,79 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tier tables for the batch path, hoisted to module scope; a
+# searchsorted over sorted bins replaces the if/elif chains with a
+# branchless binary search
+_CONSISTENCY_BINS = np.array([0.80, 0.90])
+_SAFETY_MARGINS = np.array([0.20, 0.15, 0.10])
+_CUSHION_BINS = np.array([0.15, 0.20, 0.25])
+_CONFIDENCE_TIERS = np.array([0.89, 0.91, 0.93, 0.95])
+
+# Optional Numba kernel for the batch path: the piecewise min-line math
+# compiles to a parallel loop when numba is installed
+try:
+    import numba
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _calc_minimum_kernel(season_avg, last_5_avg, consistency, main_lines):
+        n = season_avg.shape[0]
+        recommended = np.empty(n)
+        confidence = np.empty(n)
+
+        for i in numba.prange(n):
+            sa = season_avg[i]
+            if sa <= 0:
+                recommended[i] = np.nan
+                confidence[i] = 0.0
+                continue
+
+            trend = last_5_avg[i] / sa
+
+            c = consistency[i]
+            if c > 0.90:
+                margin = 0.10
+            elif c > 0.80:
+                margin = 0.15
+            else:
+                margin = 0.20
+
+            if trend > 1.05:
+                form = 1.02
+            elif trend < 0.95:
+                form = 0.98
+            else:
+                form = 1.0
+
+            rec = np.round(sa * (1 - margin) * form * 2) / 2
+
+            if rec >= main_lines[i]:
+                rec = main_lines[i] - 2.5
+
+            floor = sa * 0.75
+            if rec < floor:
+                rec = np.round(floor * 2) / 2
+
+            cushion_pct = (sa - rec) / sa
+            if cushion_pct > 0.25:
+                conf = 0.95
+            elif cushion_pct > 0.20:
+                conf = 0.93
+            elif cushion_pct > 0.15:
+                conf = 0.91
+            else:
+                conf = 0.89
+
+            recommended[i] = rec
+            confidence[i] = conf
+
+        return recommended, confidence
+else:
+    _calc_minimum_kernel = None
+
 
 class MinimumLineCalculator:
     def __init__(self):
@@ -46,29 +119,20 @@ class MinimumLineCalculator:
         # Determine safety margin based on consistency
         # More consistent players = can go closer to average
         # Less consistent = need bigger cushion
-        if consistency > 0.90:
-            # Very consistent (like Jokic, Giannis)
-            safety_margin = 0.10  # 10% below average
-        elif consistency > 0.80:
-            # Consistent (most stars)
-            safety_margin = 0.15  # 15% below average
-        else:
-            # Less consistent
-            safety_margin = 0.20  # 20% below average
-        
+        safety_margin = float(_SAFETY_MARGINS[
+            np.searchsorted(_CONSISTENCY_BINS, consistency, side='left')
+        ])
+
         # Calculate base minimum (conservative)
         base_minimum = season_avg * (1 - safety_margin)
-        
-        # Adjust based on recent form
-        if recent_trend > 1.05:
-            # Hot streak - can be slightly more aggressive
-            form_adjustment = 1.02
-        elif recent_trend < 0.95:
-            # Cold streak - be more conservative
-            form_adjustment = 0.98
-        else:
-            # Normal form
-            form_adjustment = 1.0
+
+        # Adjust based on recent form: hot streak = slightly more
+        # aggressive, cold streak = more conservative
+        form_adjustment = float(np.select(
+            [recent_trend > 1.05, recent_trend < 0.95],
+            [1.02, 0.98],
+            default=1.0
+        ))
         
         recommended_minimum = base_minimum * form_adjustment
         
@@ -90,14 +154,9 @@ class MinimumLineCalculator:
         cushion_percentage = cushion / season_avg
         
         # More cushion = higher confidence
-        if cushion_percentage > 0.25:
-            confidence = 0.95
-        elif cushion_percentage > 0.20:
-            confidence = 0.93
-        elif cushion_percentage > 0.15:
-            confidence = 0.91
-        else:
-            confidence = 0.89
+        confidence = float(_CONFIDENCE_TIERS[
+            np.searchsorted(_CUSHION_BINS, cushion_percentage, side='left')
+        ])
         
         # Build reasoning
         reasoning = self._build_reasoning(
@@ -107,7 +166,114 @@ class MinimumLineCalculator:
         
         return recommended_minimum, confidence, reasoning
     
-    def _build_reasoning(self, season_avg, last_5_avg, recommended_min, 
+    def calculate_realistic_minimum_batch(self, player_stats, main_lines):
+        """
+        Vectorized version of calculate_realistic_minimum for whole
+        columns of players at once.
+
+        Parameters:
+        - player_stats: dict of equal-length arrays with keys
+          'pts_reb_ast_avg', 'last_5_avg', 'consistency'
+        - main_lines: array of main lines, one per player
+
+        Returns:
+        - (recommended_minimums, confidences, reasonings) arrays; rows
+          without a season average come back as NaN / 0 / "Insufficient data"
+        """
+        season_avg = np.asarray(player_stats['pts_reb_ast_avg'], dtype=float)
+        last_5_avg = np.asarray(player_stats.get('last_5_avg', season_avg), dtype=float)
+        consistency = np.asarray(player_stats.get('consistency', 0.85), dtype=float)
+        if consistency.ndim == 0:
+            consistency = np.full_like(season_avg, float(consistency))
+        main_lines = np.asarray(main_lines, dtype=float)
+
+        valid = season_avg > 0
+
+        if _calc_minimum_kernel is not None:
+            # Compiled parallel kernel, same piecewise logic
+            recommended, confidence = _calc_minimum_kernel(
+                season_avg, last_5_avg, consistency, main_lines
+            )
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                recent_trend = np.where(valid, last_5_avg / season_avg, 1.0)
+
+            # Safety margin by consistency tier (same cutoffs as the
+            # scalar version)
+            safety_margin = _SAFETY_MARGINS[
+                np.searchsorted(_CONSISTENCY_BINS, consistency, side='left')
+            ]
+
+            base_minimum = season_avg * (1 - safety_margin)
+
+            # Adjust based on recent form
+            form_adjustment = np.select(
+                [recent_trend > 1.05, recent_trend < 0.95],
+                [1.02, 0.98],
+                default=1.0
+            )
+
+            # Round to nearest 0.5
+            recommended = np.round(base_minimum * form_adjustment * 2) / 2
+
+            # Ensure it's lower than the main line
+            recommended = np.where(recommended >= main_lines, main_lines - 2.5, recommended)
+
+            # Ensure it's not too low (no gimmes)
+            min_acceptable = season_avg * 0.75
+            recommended = np.where(
+                recommended < min_acceptable,
+                np.round(min_acceptable * 2) / 2,
+                recommended
+            )
+
+            # Confidence from the cushion percentage
+            cushion_pct = np.where(
+                valid, (season_avg - recommended) / np.where(valid, season_avg, 1.0), 0.0
+            )
+
+            confidence = _CONFIDENCE_TIERS[
+                np.searchsorted(_CUSHION_BINS, cushion_pct, side='left')
+            ]
+
+        cushion = season_avg - recommended
+
+        reasonings = self._build_reasoning_batch(
+            season_avg, last_5_avg, recommended, main_lines, cushion
+        )
+        reasonings = np.where(valid, reasonings, "Insufficient data").astype(object)
+
+        recommended = np.where(valid, recommended, np.nan)
+        confidence = np.where(valid, confidence, 0.0)
+
+        return recommended, confidence, reasonings
+
+    def _build_reasoning_batch(self, season_avg, last_5_avg, recommended,
+                               main_lines, cushion):
+        """Vectorized counterpart of _build_reasoning
+
+        Assembles every reasoning string from pre-formatted columns in
+        a few concatenation passes instead of per-row f-strings.
+        """
+        sa_str = pd.Series(season_avg).round(1).astype(str)
+        l5_str = pd.Series(last_5_avg).round(1).astype(str)
+        cushion_str = pd.Series(cushion).round(1).astype(str)
+        diff_str = pd.Series(main_lines - recommended).round(1).astype(str)
+
+        trend = pd.Series(np.select(
+            [last_5_avg > season_avg * 1.05, last_5_avg < season_avg * 0.95],
+            ['trending UP (L5: ', 'trending down (L5: '],
+            default='consistent (L5: '
+        ))
+
+        return (
+            'Season avg: ' + sa_str
+            + ' | ' + trend + l5_str + ')'
+            + ' | ' + cushion_str + ' pt cushion'
+            + ' | ' + diff_str + ' pts below DK line'
+        )
+
+    def _build_reasoning(self, season_avg, last_5_avg, recommended_min,
                         main_line, cushion, consistency):
         """Build human-readable reasoning"""
         parts = []
@@ -2,7 +2,10 @@
 Scrape actual game results from NBA.com API (more reliable than Basketball Reference)
 """
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import pandas as pd
 from datetime import datetime, timedelta
 import time
@@ -19,6 +22,16 @@ class NBAApiScraper:
             'Referer': 'https://www.nba.com/',
             'Origin': 'https://www.nba.com'
         }
+        # Pooled keep-alive session: every call reuses the TCP/TLS
+        # connection instead of a fresh handshake to stats.nba.com
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5)
+        )
+        self.session.mount('https://', adapter)
     
     def get_games_for_date(self, date_str):
         """Get all games for a specific date from NBA.com"""
@@ -37,10 +50,10 @@ class NBAApiScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
+            data = orjson.loads(response.content)
+
             if 'resultSets' in data:
                 games = data['resultSets'][0]['rowSet']
                 game_ids = [game[2] for game in games]  # Game IDs
@@ -65,10 +78,10 @@ class NBAApiScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
+            data = orjson.loads(response.content)
+
             player_stats = []
             
             # Get player stats from resultSets
@@ -85,15 +98,23 @@ class NBAApiScraper:
                         min_idx = headers.index('MIN')
                         
                         for row in rows:
-                            if row[min_idx] and row[min_idx] != '0:00':
-                                player_stats.append({
-                                    'player_name': row[name_idx],
-                                    'pts': float(row[pts_idx] or 0),
-                                    'reb': float(row[reb_idx] or 0),
-                                    'ast': float(row[ast_idx] or 0),
-                                    'pra': float(row[pts_idx] or 0) + float(row[reb_idx] or 0) + float(row[ast_idx] or 0),
-                                    'mp': row[min_idx]
-                                })
+                            mp = row[min_idx]
+                            if not mp or mp == '0:00':
+                                continue
+
+                            # Convert each stat once and reuse for pra
+                            pts = float(row[pts_idx] or 0)
+                            reb = float(row[reb_idx] or 0)
+                            ast = float(row[ast_idx] or 0)
+
+                            player_stats.append({
+                                'player_name': row[name_idx],
+                                'pts': pts,
+                                'reb': reb,
+                                'ast': ast,
+                                'pra': pts + reb + ast,
+                                'mp': mp
+                            })
             
             return player_stats
             
@@ -2,23 +2,40 @@
 Module for fetching NBA player prop odds from The Odds API
 """
 
+import asyncio
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import pandas as pd
 import json
+import os
 from datetime import datetime
 import time
-from config import ODDS_API_KEY, ODDS_API_BASE_URL, ODDS_DATA_CSV
+from config import ODDS_API_KEY, ODDS_API_BASE_URL, ODDS_DATA_CSV, ODDS_DATA_PARQUET
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bound the concurrent prop requests to stay inside the API rate limit
+MAX_CONCURRENT_PROP_REQUESTS = 10
+
 
 class OddsAPIFetcher:
     def __init__(self):
         self.api_key = ODDS_API_KEY
         self.base_url = ODDS_API_BASE_URL
         self.sport = "basketball_nba"
+        # Pooled keep-alive session for the sync endpoints
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5)
+        )
+        self.session.mount('https://', adapter)
         
     def get_upcoming_games(self):
         """Fetch upcoming NBA games"""
@@ -29,9 +46,9 @@ class OddsAPIFetcher:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
-            games = response.json()
+            games = orjson.loads(response.content)
             logger.info(f"Fetched {len(games)} upcoming games")
             return games
         except requests.exceptions.RequestException as e:
@@ -54,54 +71,95 @@ class OddsAPIFetcher:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             logger.info(f"Fetched player props for event {event_id}")
             return data
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching player props: {e}")
             return None
     
+    async def _fetch_props_async(self, event_ids, markets='player_points_rebounds_assists'):
+        """Fetch props for all events concurrently with a bounded fan-out"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROP_REQUESTS)
+
+        async def fetch_one(session, event_id):
+            url = f"{self.base_url}/sports/{self.sport}/events/{event_id}/odds"
+            params = {
+                'apiKey': self.api_key,
+                'regions': 'us',
+                'markets': markets,
+                'oddsFormat': 'american',
+                'dateFormat': 'iso'
+            }
+
+            async with semaphore:
+                try:
+                    async with session.get(url, params=params) as response:
+                        response.raise_for_status()
+                        data = orjson.loads(await response.read())
+                        logger.info(f"Fetched player props for event {event_id}")
+                        return data
+                except aiohttp.ClientError as e:
+                    logger.error(f"Error fetching player props: {e}")
+                    return None
+
+        async with aiohttp.ClientSession() as session:
+            return await asyncio.gather(
+                *(fetch_one(session, event_id) for event_id in event_ids)
+            )
+
     def parse_player_props_to_dataframe(self, props_data):
         """Parse player props API response into structured dataframe"""
-        records = []
-        
+        # Column-oriented accumulation: one DataFrame build from
+        # parallel lists instead of a dict per outcome, with the batch
+        # timestamp computed once
+        cols = {
+            'event_id': [], 'home_team': [], 'away_team': [],
+            'commence_time': [], 'bookmaker': [], 'market': [],
+            'player_name': [], 'line': [], 'odds': []
+        }
+        fetched_at = datetime.now().isoformat()
+
         for event in props_data:
             event_id = event.get('id')
             home_team = event.get('home_team')
             away_team = event.get('away_team')
             commence_time = event.get('commence_time')
-            
-            bookmakers = event.get('bookmakers', [])
-            
-            for bookmaker in bookmakers:
+
+            for bookmaker in event.get('bookmakers', []):
                 bookmaker_name = bookmaker.get('key')
-                markets = bookmaker.get('markets', [])
-                
-                for market in markets:
+
+                for market in bookmaker.get('markets', []):
                     market_key = market.get('key')
-                    
+
                     for outcome in market.get('outcomes', []):
-                        player_name = outcome.get('description', outcome.get('name', ''))
                         point_line = outcome.get('point')
-                        price = outcome.get('price')
-                        
-                        if point_line is not None:
-                            records.append({
-                                'event_id': event_id,
-                                'home_team': home_team,
-                                'away_team': away_team,
-                                'commence_time': commence_time,
-                                'bookmaker': bookmaker_name,
-                                'market': market_key,
-                                'player_name': player_name,
-                                'line': point_line,
-                                'odds': price,
-                                'fetched_at': datetime.now().isoformat()
-                            })
-        
-        df = pd.DataFrame(records)
+
+                        if point_line is None:
+                            continue
+
+                        cols['event_id'].append(event_id)
+                        cols['home_team'].append(home_team)
+                        cols['away_team'].append(away_team)
+                        cols['commence_time'].append(commence_time)
+                        cols['bookmaker'].append(bookmaker_name)
+                        cols['market'].append(market_key)
+                        cols['player_name'].append(
+                            outcome.get('description', outcome.get('name', ''))
+                        )
+                        cols['line'].append(point_line)
+                        cols['odds'].append(outcome.get('price'))
+
+        df = pd.DataFrame(cols)
+
+        # High-repetition strings stored as int codes plus one
+        # dictionary each; Parquet preserves the dtype
+        for col in ('bookmaker', 'market', 'home_team', 'away_team', 'player_name'):
+            df[col] = df[col].astype('category')
+
+        df['fetched_at'] = fetched_at
         return df
     
     def fetch_and_save_current_props(self):
@@ -115,56 +173,70 @@ class OddsAPIFetcher:
             logger.warning("No upcoming games found")
             return None
         
-        # Fetch props for each game
-        all_props = []
-        for game in games:  # Get ALL games
-            event_id = game.get('id')
-            props_data = self.get_player_props(event_id)
-            
-            if props_data:
-                all_props.append(props_data)
+        # Fetch props for ALL games concurrently instead of one
+        # request-latency at a time
+        event_ids = [game.get('id') for game in games if game.get('id')]
+        props_results = asyncio.run(self._fetch_props_async(event_ids))
+        all_props = [props for props in props_results if props]
         
         if not all_props:
             logger.warning("No props data available")
             return None
         
-        # Parse all props data
-        all_dfs = []
-        for props_data in all_props:
-            df = self.parse_player_props_to_dataframe([props_data])
-            if not df.empty:
-                all_dfs.append(df)
-        
-        if not all_dfs:
-            logger.warning("No player props found")
-            return None
-        
-        df = pd.concat(all_dfs, ignore_index=True)
-        
+        # Parse every event straight into the columnar builder - no
+        # per-game DataFrames and no concat holding them all at once
+        df = self.parse_player_props_to_dataframe(all_props)
+
         if df.empty:
             logger.warning("No player props found")
             return None
         
         # Filter for player_points_rebounds_assists market
         df = df[df['market'] == 'player_points_rebounds_assists']
-        
-        # Save to CSV (append mode to keep history)
-        try:
-            existing_df = pd.read_csv(ODDS_DATA_CSV)
-            df = pd.concat([existing_df, df], ignore_index=True)
-            df = df.drop_duplicates(subset=['event_id', 'player_name', 'line', 'fetched_at'], keep='last')
-        except FileNotFoundError:
-            pass
-        
-        df.to_csv(ODDS_DATA_CSV, index=False)
+
+        # Append-only save: a dated Parquet partition per fetch plus a
+        # CSV append for compatibility - history is never re-read or
+        # rewritten on the fetch path (dedupe happens at read time)
+        df = df.assign(fetch_date=datetime.now().strftime('%Y-%m-%d'))
+        df.to_parquet(ODDS_DATA_PARQUET, partition_cols=['fetch_date'], engine='pyarrow')
+
+        df = df.drop(columns=['fetch_date'])
+        df.to_csv(
+            ODDS_DATA_CSV, mode='a',
+            header=not os.path.exists(ODDS_DATA_CSV), index=False
+        )
         logger.info(f"Saved {len(df)} prop lines to {ODDS_DATA_CSV}")
-        
+
         return df
     
     def get_latest_props_for_prediction(self):
         """Get the most recent props data for making predictions"""
         try:
-            df = pd.read_csv(ODDS_DATA_CSV)
+            if os.path.isdir(ODDS_DATA_PARQUET):
+                # Only the newest fetch-date partition is read
+                dates = sorted(
+                    name.split('=', 1)[1]
+                    for name in os.listdir(ODDS_DATA_PARQUET)
+                    if name.startswith('fetch_date=')
+                )
+                if not dates:
+                    raise FileNotFoundError(ODDS_DATA_PARQUET)
+                df = pd.read_parquet(
+                    ODDS_DATA_PARQUET,
+                    filters=[('fetch_date', '=', dates[-1])]
+                )
+                df = df.drop_duplicates(
+                    subset=['event_id', 'player_name', 'line', 'fetched_at'],
+                    keep='last'
+                )
+            else:
+                df = pd.read_csv(
+                    ODDS_DATA_CSV,
+                    dtype={'line': 'float32', 'odds': 'float32'}
+                )
+                # Group keys as int codes rather than strings
+                for col in ('player_name', 'home_team', 'away_team'):
+                    df[col] = df[col].astype('category')
             df['fetched_at'] = pd.to_datetime(df['fetched_at'])
             
             # Get most recent fetch (within last 5 minutes to handle microsecond differences)
@@ -177,7 +249,12 @@ class OddsAPIFetcher:
                 df_latest = df_latest[df_latest['market'] == 'player_points_rebounds_assists']
             
             # Group by player and game, take the MINIMUM line available (easiest to hit)
-            df_grouped = df_latest.groupby(['player_name', 'home_team', 'away_team']).agg({
+            # observed=True keeps categorical group keys from expanding
+            # into the full category product
+            df_grouped = df_latest.groupby(
+                ['player_name', 'home_team', 'away_team'],
+                observed=True, sort=False
+            ).agg({
                 'line': 'min',  # Use minimum line (most favorable)
                 'odds': 'first',
                 'commence_time': 'first'
@@ -7,10 +7,27 @@ Incremental Player Consistency Backtest
 - Much faster for weekly updates
 """
 
+import asyncio
+import hashlib
+import json
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from rapidfuzz import fuzz, process
 from datetime import datetime
+import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Async fetch path: one thread, many in-flight requests, no per-thread
+# stacks; the thread pool below stays as the fallback
+try:
+    import aiohttp
+    _HAS_AIOHTTP = True
+except ImportError:
+    _HAS_AIOHTTP = False
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -21,27 +38,177 @@ SEASON = '2025-26'
 BUFFER = 5.0
 CSV_DIR = 'data/csv'
 CACHE_FILE = os.path.join(CSV_DIR, 'season_game_results.csv')
+# Typed columnar cache: new games land as extra part files instead of
+# rewriting (and later re-parsing) one big CSV
+CACHE_PARQUET_DIR = os.path.join(CSV_DIR, 'season_game_results_parquet')
 GAMES_PROCESSED_FILE = os.path.join(CSV_DIR, 'games_processed.txt')
+SEASON_GAMES_CACHE = os.path.join(CSV_DIR, 'season_games.json')
+SEASON_GAMES_TTL = 3600  # re-hit the NBA API at most once an hour
+SIGNATURE_FILE = os.path.join(CSV_DIR, '.consistency_sig')
+
+
+def _input_signature(processed_games):
+    """Signature of everything the consistency output depends on"""
+    try:
+        stats_mtime = os.path.getmtime(os.path.join(CSV_DIR, 'player_stats.csv'))
+    except OSError:
+        stats_mtime = 0
+    return hashlib.sha1(
+        f"{len(processed_games)}:{stats_mtime}".encode()
+    ).hexdigest()
 CONSISTENCY_FILE = os.path.join(CSV_DIR, 'player_consistency.csv')
 
+MAX_FETCH_WORKERS = 4
+REQUEST_INTERVAL = 0.6  # NBA API spacing, shared across fetch threads
+
+
+class _RateLimiter:
+    """Enforces the global request spacing across fetch threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_limiter = _RateLimiter(REQUEST_INTERVAL)
+
+NBA_BOX_SCORE_URL = 'https://stats.nba.com/stats/boxscoretraditionalv3'
+NBA_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Referer': 'https://www.nba.com/',
+    'Origin': 'https://www.nba.com'
+}
+
+
+def _parse_box_score_json(game_id, data):
+    """Rows straight from the V3 JSON - skips the nba_api DataFrame"""
+    rows = []
+    box = data.get('boxScoreTraditional') or {}
+
+    for side in ('homeTeam', 'awayTeam'):
+        for player in (box.get(side) or {}).get('players', []):
+            stats = player.get('statistics') or {}
+            player_name = (
+                f"{player.get('firstName', '')} {player.get('familyName', '')}".strip()
+            )
+
+            pts = stats.get('points') or 0
+            reb = stats.get('reboundsTotal') or 0
+            ast = stats.get('assists') or 0
+            pra = pts + reb + ast
+
+            if pra > 0 and player_name:
+                rows.append({
+                    'game_id': game_id,
+                    'player_name': player_name,
+                    'pts': pts,
+                    'reb': reb,
+                    'ast': ast,
+                    'pra': pra
+                })
+
+    return rows
+
+
+async def _fetch_new_games_async(new_game_ids, processed_file):
+    """Fan the box score fetches out over one aiohttp session"""
+    results = []
+    done = 0
+    next_time = 0.0
+
+    async def pace():
+        # Single-threaded event loop, so plain state suffices to keep
+        # the same one-request-per-interval budget
+        nonlocal next_time
+        now = time.monotonic()
+        delay = next_time - now
+        next_time = max(now, next_time) + REQUEST_INTERVAL
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def fetch_one(session, game_id):
+        params = {
+            'GameID': game_id, 'StartPeriod': 0, 'EndPeriod': 10,
+            'StartRange': 0, 'EndRange': 28800, 'RangeType': 0
+        }
+
+        await pace()
+        try:
+            async with session.get(NBA_BOX_SCORE_URL, params=params,
+                                   timeout=aiohttp.ClientTimeout(total=30)) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+        except Exception as e:
+            print(f"  Error fetching {game_id}: {e}")
+            return game_id, []
+
+        return game_id, _parse_box_score_json(game_id, data)
+
+    async with aiohttp.ClientSession(headers=NBA_API_HEADERS) as session:
+        tasks = [fetch_one(session, game_id) for game_id in new_game_ids]
+
+        for coro in asyncio.as_completed(tasks):
+            game_id, rows = await coro
+            results.extend(rows)
+            save_processed_games(processed_file, [game_id])
+
+            done += 1
+            if done % 10 == 0:
+                print(f"Progress: {done}/{len(new_game_ids)} new games... ({len(results)} players)")
+
+    return results
+
+
+# In-process cache keyed on the file mtime so repeated calls in one
+# run don't re-read the whole list
+_processed_cache = {'mtime': None, 'games': set()}
+
 
 def get_processed_games():
-    """Load list of already processed game IDs"""
+    """Load list of already processed game IDs (mtime-cached)"""
     try:
-        with open(GAMES_PROCESSED_FILE, 'r') as f:
-            return set(line.strip() for line in f if line.strip())
-    except FileNotFoundError:
+        mtime = os.path.getmtime(GAMES_PROCESSED_FILE)
+    except OSError:
         return set()
 
+    if _processed_cache['mtime'] == mtime:
+        return _processed_cache['games']
 
-def save_processed_game(game_id):
-    """Append a game ID to the processed list"""
-    with open(GAMES_PROCESSED_FILE, 'a') as f:
-        f.write(f"{game_id}\n")
+    with open(GAMES_PROCESSED_FILE, 'r') as f:
+        games = set(line.strip() for line in f if line.strip())
+
+    _processed_cache['mtime'] = mtime
+    _processed_cache['games'] = games
+    return games
+
+
+def save_processed_games(f, game_ids):
+    """Write a batch of game IDs through an already-open handle"""
+    if not game_ids:
+        return
+    f.writelines(f"{game_id}\n" for game_id in game_ids)
 
 
 def get_all_season_games():
-    """Get all game IDs from current season"""
+    """Get all game IDs from current season (disk-cached with a TTL)"""
+    try:
+        if time.time() - os.path.getmtime(SEASON_GAMES_CACHE) < SEASON_GAMES_TTL:
+            with open(SEASON_GAMES_CACHE, 'r') as f:
+                game_ids = json.load(f)
+            print(f"Found {len(game_ids)} total games this season (cached)")
+            return set(game_ids)
+    except (OSError, ValueError):
+        pass
+
     print("Fetching game list from NBA API...")
     game_finder = leaguegamefinder.LeagueGameFinder(
         season_nullable=SEASON,
@@ -50,13 +217,17 @@ def get_all_season_games():
     games_df = game_finder.get_data_frames()[0]
     game_ids = games_df['GAME_ID'].unique()
     print(f"Found {len(game_ids)} total games this season")
+
+    with open(SEASON_GAMES_CACHE, 'w') as f:
+        json.dump(list(game_ids), f)
+
     return set(game_ids)
 
 
 def get_box_score(game_id):
     """Get box score for a specific game - V3 format"""
     try:
-        time.sleep(0.6)
+        _limiter.wait()
         box = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id)
         dfs = box.get_data_frames()
         
@@ -72,6 +243,12 @@ def get_box_score(game_id):
 
 def load_existing_results():
     """Load existing player performance data"""
+    if os.path.isdir(CACHE_PARQUET_DIR):
+        df = pd.read_parquet(CACHE_PARQUET_DIR)
+        print(f"Loaded {len(df)} existing player performances (may include duplicates)")
+        return df
+
+    # Legacy CSV cache from before the Parquet switch
     try:
         df = pd.read_csv(CACHE_FILE)
         print(f"Loaded {len(df)} existing player performances (may include duplicates)")
@@ -80,9 +257,13 @@ def load_existing_results():
         return pd.DataFrame()
 
 
-def save_results(results_df):
-    """Save player performance data"""
-    results_df.to_csv(CACHE_FILE, index=False)
+def save_results(new_df):
+    """Append new player performances as a fresh Parquet part file"""
+    if new_df.empty:
+        return
+    os.makedirs(CACHE_PARQUET_DIR, exist_ok=True)
+    part = os.path.join(CACHE_PARQUET_DIR, f"part-{int(time.time() * 1000)}.parquet")
+    new_df.to_parquet(part, engine='pyarrow', index=False)
 
 
 def load_player_averages():
@@ -96,48 +277,82 @@ def load_player_averages():
         return {}
 
 
+def parse_box_score_rows(game_id, player_df):
+    """Extract player PRA rows from one box score frame, column-wise"""
+    if player_df is None or player_df.empty:
+        return []
+
+    def stat_col(name, fallback=None):
+        if name in player_df.columns:
+            return pd.to_numeric(player_df[name], errors='coerce').fillna(0)
+        if fallback is not None and fallback in player_df.columns:
+            return pd.to_numeric(player_df[fallback], errors='coerce').fillna(0)
+        return pd.Series(0.0, index=player_df.index)
+
+    def name_col(name):
+        if name in player_df.columns:
+            return player_df[name].fillna('').astype(str)
+        return pd.Series('', index=player_df.index)
+
+    pdf = pd.DataFrame({
+        'game_id': game_id,
+        'player_name': (name_col('firstName') + ' ' + name_col('familyName')).str.strip(),
+        'pts': stat_col('points'),
+        'reb': stat_col('reboundsTotal', 'rebounds'),
+        'ast': stat_col('assists')
+    })
+    pdf['pra'] = pdf['pts'] + pdf['reb'] + pdf['ast']
+
+    # One mask instead of per-row checks
+    pdf = pdf[(pdf['pra'] > 0) & (pdf['player_name'] != '')]
+
+    return pdf.to_dict('records')
+
+
 def fetch_new_games(new_game_ids):
-    """Fetch box scores for new games only"""
+    """Fetch box scores for new games only, overlapping the waits"""
     new_results = []
-    
+    processed_batch = []
+    done = 0
+
     print(f"\nFetching {len(new_game_ids)} NEW games...")
     print("(Previously processed games are skipped)\n")
-    
-    for i, game_id in enumerate(new_game_ids):
-        if i % 10 == 0:
-            print(f"Progress: {i}/{len(new_game_ids)} new games... ({len(new_results)} players)")
-        
-        player_df = get_box_score(game_id)
-        
-        if player_df is None or player_df.empty:
-            save_processed_game(game_id)
-            continue
-        
-        for _, row in player_df.iterrows():
-            try:
-                first_name = row.get('firstName', '')
-                last_name = row.get('familyName', '')
-                player_name = f"{first_name} {last_name}".strip()
-                
-                pts = row.get('points', 0) or 0
-                reb = row.get('reboundsTotal', row.get('rebounds', 0)) or 0
-                ast = row.get('assists', 0) or 0
-                pra = pts + reb + ast
-                
-                if pra > 0 and player_name:
-                    new_results.append({
-                        'game_id': game_id,
-                        'player_name': player_name,
-                        'pts': pts,
-                        'reb': reb,
-                        'ast': ast,
-                        'pra': pra
-                    })
-            except Exception:
-                continue
-        
-        save_processed_game(game_id)
-    
+
+    if _HAS_AIOHTTP:
+        with open(GAMES_PROCESSED_FILE, 'a', buffering=1) as processed_file:
+            new_results = asyncio.run(
+                _fetch_new_games_async(new_game_ids, processed_file)
+            )
+        print(f"\n✓ Fetched {len(new_results)} player performances from {len(new_game_ids)} new games")
+        return new_results
+
+    def fetch_one(game_id):
+        return game_id, parse_box_score_rows(game_id, get_box_score(game_id))
+
+    # The shared limiter keeps the request rate at one per interval;
+    # the pool just overlaps the network waits. The processed-games
+    # file is opened once (line-buffered) for the whole run rather
+    # than an open/close pair per write.
+    with open(GAMES_PROCESSED_FILE, 'a', buffering=1) as processed_file, \
+            ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as pool:
+        futures = [pool.submit(fetch_one, game_id) for game_id in new_game_ids]
+
+        for future in as_completed(futures):
+            game_id, rows = future.result()
+            new_results.extend(rows)
+            processed_batch.append(game_id)
+
+            # Flush processed ids in batches to amortize the syscalls
+            if len(processed_batch) >= 10:
+                save_processed_games(processed_file, processed_batch)
+                processed_batch = []
+
+            done += 1
+            if done % 10 == 0:
+                print(f"Progress: {done}/{len(new_game_ids)} new games... ({len(new_results)} players)")
+
+        save_processed_games(processed_file, processed_batch)
+
     print(f"\n✓ Fetched {len(new_results)} player performances from {len(new_game_ids)} new games")
     return new_results
 
@@ -145,53 +360,66 @@ def fetch_new_games(new_game_ids):
 def calculate_player_records(results_df, averages):
     """Calculate win/loss record for each player"""
     
-    # CRITICAL FIX: Remove duplicates (same player + same game)
-    print("\nRemoving duplicate game entries...")
-    original_count = len(results_df)
-    results_df = results_df.drop_duplicates(subset=['game_id', 'player_name'], keep='first')
-    deduped_count = len(results_df)
-    print(f"  Removed {original_count - deduped_count} duplicates")
-    print(f"  Clean records: {deduped_count}")
-    
-    player_records = {}
-    
-    for player_name, avg_pra in averages.items():
-        recommended_min = avg_pra - BUFFER
-        
-        # Try exact match first
-        matches = results_df[results_df['player_name'] == player_name]
-        
-        # If no exact match, try fuzzy
-        if len(matches) == 0:
-            name_parts = player_name.replace('.', '').split()
-            if len(name_parts) >= 2:
-                first = name_parts[0].lower()
-                last = name_parts[-1].lower()
-                if last in ['jr', 'iii', 'ii', 'iv'] and len(name_parts) > 2:
-                    last = name_parts[-2].lower()
-                
-                matches = results_df[
-                    results_df['player_name'].str.lower().str.contains(first, na=False) &
-                    results_df['player_name'].str.lower().str.contains(last, na=False)
-                ]
-        
-        if len(matches) == 0:
+    # Duplicates are now filtered out at ingest, so no full-frame
+    # dedup pass is needed here
+
+    # Resolve each averaged player to a canonical results name (exact
+    # first, RapidFuzz fallback for Jr/III-style noise), then tally
+    # every record in one merged groupby pass instead of a boolean
+    # mask plus two Python sums per player
+    unique_names = results_df['player_name'].unique().tolist()
+    name_set = set(unique_names)
+
+    canonical = {}
+    for player_name in averages:
+        if player_name in name_set:
+            canonical[player_name] = player_name
             continue
-        
-        wins = sum(matches['pra'] >= recommended_min)
-        losses = sum(matches['pra'] < recommended_min)
-        
-        if wins + losses >= 3:  # Minimum 3 games
-            win_pct = 100 * wins / (wins + losses)
-            player_records[player_name] = {
-                'wins': wins,
-                'losses': losses,
-                'win_pct': win_pct,
-                'games': wins + losses,
-                'avg_pra': avg_pra,
-                'recommended_min': recommended_min
-            }
-    
+
+        best = process.extractOne(
+            player_name, unique_names,
+            scorer=fuzz.token_set_ratio, score_cutoff=85
+        )
+        if best is not None:
+            canonical[player_name] = best[0]
+
+    if not canonical:
+        return {}
+
+    thresholds = pd.DataFrame({
+        'player_name': [canonical[p] for p in canonical],
+        'avg_player': list(canonical),
+        'avg_pra': [averages[p] for p in canonical],
+        'recommended_min': [averages[p] - BUFFER for p in canonical]
+    }).drop_duplicates(subset=['player_name'], keep='first')
+
+    # Only the columns the tally needs go through the join
+    merged = results_df[['player_name', 'pra']].merge(
+        thresholds, on='player_name', how='inner'
+    )
+    merged['win'] = merged['pra'] >= merged['recommended_min']
+
+    agg = merged.groupby('avg_player', sort=False).agg(
+        wins=('win', 'sum'),
+        games=('win', 'count'),
+        avg_pra=('avg_pra', 'first'),
+        recommended_min=('recommended_min', 'first')
+    )
+    agg = agg[agg['games'] >= 3]  # Minimum 3 games
+
+    player_records = {}
+    for player_name, row in agg.iterrows():
+        wins = int(row['wins'])
+        games = int(row['games'])
+        player_records[player_name] = {
+            'wins': wins,
+            'losses': games - wins,
+            'win_pct': 100 * wins / games,
+            'games': games,
+            'avg_pra': row['avg_pra'],
+            'recommended_min': row['recommended_min']
+        }
+
     return player_records
 
 
@@ -218,6 +446,19 @@ def run_incremental_backtest():
     existing_df = load_existing_results()
     
     if len(new_games) == 0:
+        # Neither games nor averages changed - the existing output is
+        # still correct, so skip the whole recompute
+        signature = _input_signature(processed_games)
+        try:
+            with open(SIGNATURE_FILE, 'r') as f:
+                previous = f.read().strip()
+        except FileNotFoundError:
+            previous = None
+
+        if signature == previous and os.path.exists(CONSISTENCY_FILE):
+            print("\n✓ No new games and averages unchanged - keeping existing consistency file")
+            return
+
         print("\n✓ No new games to process!")
         print("Using existing data to recalculate consistency...")
         results_df = existing_df
@@ -228,13 +469,22 @@ def run_incremental_backtest():
         # Combine with existing
         if len(new_results) > 0:
             new_df = pd.DataFrame(new_results)
+
+            # Dedupe on ingest: skip (game, player) rows the cache
+            # already holds instead of a post-hoc drop_duplicates
+            if not existing_df.empty:
+                seen = set(zip(existing_df['game_id'].astype(str),
+                               existing_df['player_name']))
+                keys = zip(new_df['game_id'].astype(str), new_df['player_name'])
+                new_df = new_df[[key not in seen for key in keys]]
+
             if not existing_df.empty:
                 results_df = pd.concat([existing_df, new_df], ignore_index=True)
             else:
                 results_df = new_df
-            
-            # Save combined results (still may have duplicates from previous runs)
-            save_results(results_df)
+
+            # Only the new rows hit disk; history is never rewritten
+            save_results(new_df)
             print(f"✓ Total: {len(results_df)} player performances saved (may include duplicates)")
         else:
             results_df = existing_df
@@ -255,10 +505,15 @@ def run_incremental_backtest():
         key=lambda x: (-x[1]['win_pct'], -x[1]['games'])
     )
     
-    # Display summary
-    reliable = len([p for p, r in sorted_players if r['win_pct'] >= 80])
-    moderate = len([p for p, r in sorted_players if 60 <= r['win_pct'] < 80])
-    avoid = len([p for p, r in sorted_players if r['win_pct'] < 60])
+    # Display summary - one searchsorted pass assigns every tier
+    # (0=avoid, 1=moderate, 2=reliable) instead of three list scans
+    pcts = np.fromiter(
+        (r['win_pct'] for _, r in sorted_players),
+        dtype=np.float32, count=len(sorted_players)
+    )
+    tier_idx = np.searchsorted([60, 80], pcts, side='right')
+    tier_counts = np.bincount(tier_idx, minlength=3)
+    avoid, moderate, reliable = (int(c) for c in tier_counts)
     
     print(f"\n" + "=" * 70)
     print(f"RESULTS: {reliable} reliable (80%+), {moderate} moderate (60-79%), {avoid} avoid (<60%)")
@@ -276,6 +531,7 @@ def run_incremental_backtest():
             print(f"  {player}: {record['wins']}-{record['losses']} ({record['win_pct']:.1f}%)")
     
     # Save to CSV
+    tier_labels = ('❌ AVOID', '⚠️ MODERATE', '🏆 RELIABLE')
     records_list = [{
         'player_name': p,
         'wins': r['wins'],
@@ -284,14 +540,19 @@ def run_incremental_backtest():
         'games': r['games'],
         'avg_pra': round(r['avg_pra'], 1),
         'recommended_min': round(r['recommended_min'], 1),
-        'tier': '🏆 RELIABLE' if r['win_pct'] >= 80 else ('⚠️ MODERATE' if r['win_pct'] >= 60 else '❌ AVOID')
-    } for p, r in sorted_players]
+        'tier': tier_labels[tier]
+    } for (p, r), tier in zip(sorted_players, tier_idx)]
     
-    pd.DataFrame(records_list).to_csv(CONSISTENCY_FILE, index=False)
+    # Arrow's C++ CSV writer, straight from the record dicts - no
+    # intermediate pandas frame
+    pa_csv.write_csv(pa.Table.from_pylist(records_list), CONSISTENCY_FILE)
     print(f"\n✓ Saved {len(records_list)} players to {CONSISTENCY_FILE}")
     
-    total_games = len(get_processed_games())
-    print(f"✓ Total games in database: {total_games}")
+    processed = get_processed_games()
+    print(f"✓ Total games in database: {len(processed)}")
+
+    with open(SIGNATURE_FILE, 'w') as f:
+        f.write(_input_signature(processed))
 
 
 def run_full_reset():
@@ -305,6 +566,9 @@ def run_full_reset():
     # Clear cached results
     if os.path.exists(CACHE_FILE):
         os.remove(CACHE_FILE)
+    if os.path.isdir(CACHE_PARQUET_DIR):
+        import shutil
+        shutil.rmtree(CACHE_PARQUET_DIR)
     
     print("✓ Cache cleared. Running full backtest...")
     run_incremental_backtest()
@@ -4,6 +4,8 @@ Track prediction results and calculate win/loss record
 
 import pandas as pd
 import json
+import re
+from collections import defaultdict
 from datetime import datetime
 from config import PREDICTIONS_CSV, CSV_DIR
 import os
@@ -11,21 +13,62 @@ import os
 RESULTS_FILE = os.path.join(CSV_DIR, 'pick_results.csv')
 RECORD_FILE = os.path.join(CSV_DIR, 'overall_record.json')
 
+# Strips generational suffixes from a name token in one compiled pass
+SUFFIX_RE = re.compile(r'\b(Jr|Sr|II|III|IV)\.?$')
+
 
 class ResultsTracker:
     def __init__(self):
         self.results_file = RESULTS_FILE
         self.record_file = RECORD_FILE
-        
-    def mark_result(self, player_name, date, result, actual_pra=None):
+        # Predictions plus their normalized-name indexes, cached on
+        # the file mtime so repeated marks don't re-normalize
+        self._pred_df = None
+        self._pred_mtime = None
+        self._pred_norm = None
+        self._by_full = None
+        self._by_last = None
+
+    def _load_predictions(self):
+        """Load predictions and name indexes, reusing them until the
+        predictions file changes on disk"""
+        mtime = os.path.getmtime(PREDICTIONS_CSV)
+
+        if self._pred_df is not None and mtime == self._pred_mtime:
+            return self._pred_df
+
+        pred_df = pd.read_csv(PREDICTIONS_CSV)
+
+        norm = (
+            pred_df['player_name'].fillna('')
+            .str.replace('.', '', regex=False).str.strip().str.lower()
+        )
+        by_full = {}
+        by_last = defaultdict(list)
+        for i, name in enumerate(norm):
+            by_full.setdefault(name, i)
+            parts = name.split()
+            if parts:
+                by_last[parts[-1]].append(i)
+
+        self._pred_df = pred_df
+        self._pred_mtime = mtime
+        self._pred_norm = norm
+        self._by_full = by_full
+        self._by_last = by_last
+
+        return pred_df
+
+    def mark_result(self, player_name, date, result, actual_pra=None, batch=None):
         """
         Mark a pick as win or loss
-        
+
         Args:
             player_name: Player name
             date: Date of game (YYYY-MM-DD)
             result: 'W' for win, 'L' for loss
             actual_pra: Actual PRA scored (optional)
+            batch: optional list collecting rows for one bulk write
         """
         try:
             df = pd.read_csv(self.results_file)
@@ -35,25 +78,30 @@ class ResultsTracker:
                 'actual_pra', 'result', 'marked_at'
             ])
         
-        # Get the prediction - use fuzzy matching
-        pred_df = pd.read_csv(PREDICTIONS_CSV)
-        
+        # Get the prediction - cached hash indexes, no column scans
+        pred_df = self._load_predictions()
+        norm = self._pred_norm
+        by_full = self._by_full
+        by_last = self._by_last
+
         # Try exact match first (normalized)
-        pred_name_norm = player_name.replace('.', '').strip()
-        pred = pred_df[pred_df['player_name'].str.replace('.', '').str.strip().str.lower() == pred_name_norm.lower()]
-        
+        pred_name_norm = player_name.replace('.', '').strip().lower()
+        idx = by_full.get(pred_name_norm)
+
         # If no match, try last name
-        if pred.empty:
-            last_name = player_name.split()[-1].replace('.', '').replace('Jr', '').replace('III', '').replace('II', '').strip()
+        if idx is None:
+            last_name = SUFFIX_RE.sub('', player_name.split()[-1]).replace('.', '').strip().lower()
             if last_name and len(last_name) > 2:
-                pred = pred_df[pred_df['player_name'].str.contains(last_name, case=False, na=False)]
-                if len(pred) > 1:
-                    first_name = player_name.split()[0]
-                    temp_pred = pred[pred['player_name'].str.contains(first_name, case=False, na=False)]
-                    if not temp_pred.empty:
-                        pred = temp_pred
-        
-        if pred.empty:
+                candidates = by_last.get(last_name, [])
+                if len(candidates) > 1:
+                    first_name = player_name.split()[0].lower()
+                    narrowed = [i for i in candidates if norm.iloc[i].startswith(first_name)]
+                    if narrowed:
+                        candidates = narrowed
+                if candidates:
+                    idx = candidates[0]
+
+        if idx is None:
             print(f"No prediction found for {player_name}")
             return
         
@@ -62,9 +110,12 @@ class ResultsTracker:
             already_marked = df[(df['player_name'] == player_name) & (df['date'] == date)]
             if not already_marked.empty:
                 return  # Already marked, skip
+        if batch is not None and any(
+                b['player_name'] == player_name and b['date'] == date for b in batch):
+            return
         
-        pred = pred.iloc[0]
-        
+        pred = pred_df.iloc[idx]
+
         # Add result
         new_result = {
             'date': date,
@@ -75,24 +126,44 @@ class ResultsTracker:
             'marked_at': datetime.now().isoformat()
         }
         
-        df = pd.concat([df, pd.DataFrame([new_result])], ignore_index=True)
-        df.to_csv(self.results_file, index=False)
-        
+        # In batch mode the caller owns the write
+        if batch is not None:
+            batch.append(new_result)
+            print(f"✓ Marked {player_name} as {result.upper()}")
+            return
+
+        # O(1) append of the one new row; history isn't rewritten
+        pd.DataFrame([new_result]).to_csv(
+            self.results_file, mode='a',
+            header=not os.path.exists(self.results_file), index=False
+        )
+
         print(f"✓ Marked {player_name} as {result.upper()}")
-        
+
         # Update overall record
         self.update_record()
-        
+
     def mark_multiple(self, results_dict, date):
         """
-        Mark multiple results at once
-        
+        Mark multiple results with one CSV write and record update
+
         Args:
             results_dict: {'Player Name': ('W', actual_pra), ...}
             date: Date of games
         """
+        batch = []
         for player, (result, actual) in results_dict.items():
-            self.mark_result(player, date, result, actual)
+            self.mark_result(player, date, result, actual, batch=batch)
+
+        if not batch:
+            return
+
+        # One O(new rows) append for the whole slate
+        pd.DataFrame(batch).to_csv(
+            self.results_file, mode='a',
+            header=not os.path.exists(self.results_file), index=False
+        )
+        self.update_record()
     
     def update_record(self):
         """Calculate and save overall record"""
@@ -3,8 +3,8 @@ Automated scheduler for regular updates and predictions
 Can be run as a cron job or scheduled task
 """
 
-import schedule
-import time
+import asyncio
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime
 import logging
 from main import NBAPropSystem
@@ -104,47 +104,50 @@ def run_scheduler(mode='dev'):
     - prod: Production schedule (hours/days)
     """
     scheduler = Scheduler()
-    
+    sched = AsyncIOScheduler()
+
     if mode == 'dev':
         # Development schedule - for testing
         logger.info("Running in DEVELOPMENT mode (quick schedule)")
-        
-        schedule.every(5).minutes.do(scheduler.daily_update_job)
-        schedule.every(10).minutes.do(scheduler.prediction_job)
-        schedule.every(30).minutes.do(scheduler.health_check)
-    
+
+        sched.add_job(scheduler.daily_update_job, 'interval', minutes=5)
+        sched.add_job(scheduler.prediction_job, 'interval', minutes=10)
+        sched.add_job(scheduler.health_check, 'interval', minutes=30)
+
     else:
         # Production schedule
         logger.info("Running in PRODUCTION mode")
-        
+
         # Update data every morning at 8 AM
-        schedule.every().day.at("08:00").do(scheduler.daily_update_job)
-        
+        sched.add_job(scheduler.daily_update_job, 'cron', hour=8)
+
         # Generate predictions at 10 AM and 5 PM
-        schedule.every().day.at("10:00").do(scheduler.prediction_job)
-        schedule.every().day.at("17:00").do(scheduler.prediction_job)
-        
+        sched.add_job(scheduler.prediction_job, 'cron', hour='10,17')
+
         # Retrain model every Sunday at 2 AM
-        schedule.every().sunday.at("02:00").do(scheduler.weekly_training_job)
-        
+        sched.add_job(scheduler.weekly_training_job, 'cron', day_of_week='sun', hour=2)
+
         # Cleanup old data every Sunday at 3 AM
-        schedule.every().sunday.at("03:00").do(scheduler.cleanup_job)
-        
+        sched.add_job(scheduler.cleanup_job, 'cron', day_of_week='sun', hour=3)
+
         # Health check twice daily
-        schedule.every().day.at("12:00").do(scheduler.health_check)
-        schedule.every().day.at("20:00").do(scheduler.health_check)
-    
-    logger.info("Scheduler started. Press Ctrl+C to stop.")
-    logger.info("Scheduled jobs:")
-    for job in schedule.get_jobs():
-        logger.info(f"  - {job}")
-    
-    # Run indefinitely
+        sched.add_job(scheduler.health_check, 'cron', hour='12,20')
+
+    # AsyncIOScheduler has to start from inside a running loop; the
+    # loop then sleeps until the next job fires - no wakeups just to
+    # poll for pending work
+    async def _run():
+        sched.start()
+
+        logger.info("Scheduler started. Press Ctrl+C to stop.")
+        logger.info("Scheduled jobs:")
+        for job in sched.get_jobs():
+            logger.info(f"  - {job}")
+
+        await asyncio.Event().wait()
+
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-    
+        asyncio.run(_run())
     except KeyboardInterrupt:
         logger.info("\nScheduler stopped by user")
 
@@ -2,21 +2,47 @@
 Module for scraping NBA player statistics from Basketball Reference
 """
 
+import io
+import numpy as np
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import pandas as pd
+import os
+import shelve
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 from config import (
-    NBA_STATS_URL, PLAYER_STATS_CSV, GAME_RESULTS_CSV, 
-    UPDATE_CHECKPOINT_FILE, CURRENT_SEASON
+    NBA_STATS_URL, PLAYER_STATS_CSV, PLAYER_STATS_PARQUET,
+    GAME_RESULTS_CSV, SCHEDULE_CSV, UPDATE_CHECKPOINT_FILE, CURRENT_SEASON
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+REQUEST_INTERVAL = 3.0  # Basketball Reference spacing, shared globally
+
+
+class _RateLimiter:
+    """Token bucket shared by concurrent scrape threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
 
 class PlayerStatsScraper:
     def __init__(self):
@@ -25,61 +51,118 @@ class PlayerStatsScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         self.checkpoint_data = self.load_checkpoint()
+        self.limiter = _RateLimiter(REQUEST_INTERVAL)
+        # Stats frame plus a name->row index, cached on the file mtime
+        self._stats_cache = None
+        self._stats_mtime = None
+        self._player_index = None
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
+        # Keep-alive pooled session with gzip and retry-with-backoff,
+        # instead of a fresh TCP/TLS handshake per module-level get
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1.0,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
         
     def load_checkpoint(self):
-        """Load last update checkpoint to avoid re-scraping"""
+        """Load last update checkpoint to avoid re-scraping
+
+        Backed by a dbm store: keyed O(1) access with no JSON
+        tokenization on every scraper start.
+        """
+        with shelve.open(UPDATE_CHECKPOINT_FILE + '.db') as db:
+            data = dict(db)
+        if data:
+            return data
+
+        # Legacy JSON checkpoint from before the shelve switch
         try:
             with open(UPDATE_CHECKPOINT_FILE, 'r') as f:
                 return json.load(f)
         except FileNotFoundError:
             return {'last_update': None, 'last_game_date': None}
-    
+
     def save_checkpoint(self, checkpoint_data):
         """Save checkpoint data"""
-        with open(UPDATE_CHECKPOINT_FILE, 'w') as f:
-            json.dump(checkpoint_data, f)
+        with shelve.open(UPDATE_CHECKPOINT_FILE + '.db') as db:
+            for key, value in checkpoint_data.items():
+                db[key] = value
     
     def scrape_player_season_stats(self, season='2026'):
         """Scrape per-game stats for all players in a season"""
         url = f"{self.base_url}/leagues/NBA_{season}_per_game.html"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            self.limiter.wait()  # Rate limiting
+
+            # Conditional GET: a 304 answer is ~200 bytes instead of
+            # the full table HTML when nothing changed upstream
+            etags = self.checkpoint_data.setdefault('etags', {})
+            headers = {'If-None-Match': etags[url]} if url in etags else {}
+            response = self.session.get(url, headers=headers)
+
+            if response.status_code == 304:
+                logger.info("Stats page unchanged (304); reusing cached stats")
+                try:
+                    return pd.read_csv(PLAYER_STATS_CSV)
+                except FileNotFoundError:
+                    # Cache is gone - refetch unconditionally
+                    etags.pop(url, None)
+                    self.limiter.wait()
+                    response = self.session.get(url)
+
             response.raise_for_status()
-            time.sleep(3)  # Rate limiting
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            table = soup.find('table', {'id': 'per_game_stats'})
-            
-            if not table:
+
+            if response.headers.get('ETag'):
+                etags[url] = response.headers['ETag']
+                self.save_checkpoint(self.checkpoint_data)
+
+            # Parse table - read_html runs lxml once over the raw
+            # bytes (wrapped in BytesIO so they aren't mistaken for a
+            # path), no bs4 tree or str(table) round-trip
+            try:
+                df = pd.read_html(
+                    io.BytesIO(response.content),
+                    attrs={'id': 'per_game_stats'}, flavor='lxml'
+                )[0]
+            except ValueError:
                 logger.error("Could not find stats table")
                 return None
             
-            # Parse table
-            df = pd.read_html(str(table))[0]
-            
-            # Clean up data
-            df = df[df['Player'] != 'Player']  # Remove header rows
-            df = df[df['Rk'] != 'Rk']
+            # Clean up data - one fused mask removes the repeated
+            # header rows without an intermediate frame
+            df = df[(df['Player'] != 'Player') & (df['Rk'] != 'Rk')]
             
             # Convert numeric columns
             numeric_columns = ['Age', 'G', 'GS', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', 
                              '3P%', '2P', '2PA', '2P%', 'eFG%', 'FT', 'FTA', 'FT%',
                              'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
             
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            # One batched conversion; downcast='float' lands float32,
+            # halving memory for the later rolling/groupby passes
+            num_cols = [c for c in numeric_columns if c in df.columns]
+            df[num_cols] = df[num_cols].apply(
+                pd.to_numeric, errors='coerce', downcast='float'
+            )
             
             # Add season
             df['season'] = season
             df['scraped_at'] = datetime.now().isoformat()
             
-            logger.info(f"Scraped stats for {len(df)} player-team combinations")
+            logger.info("Scraped stats for %d player-team combinations", len(df))
             return df
             
         except Exception as e:
-            logger.error(f"Error scraping season stats: {e}")
+            logger.error("Error scraping season stats: %s", e)
             return None
     
     def scrape_player_game_log(self, player_name, season='2026'):
@@ -98,119 +181,183 @@ class PlayerStatsScraper:
         url = f"{self.base_url}/leagues/NBA_{season}_games.html"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            self.limiter.wait()
+            response = self.session.get(url)
             response.raise_for_status()
-            time.sleep(3)
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            table = soup.find('table', {'id': 'schedule'})
-            
-            if not table:
+
+            try:
+                df = pd.read_html(
+                    io.BytesIO(response.content),
+                    attrs={'id': 'schedule'}, flavor='lxml'
+                )[0]
+            except ValueError:
                 logger.error("Could not find schedule table")
                 return None
-            
-            df = pd.read_html(str(table))[0]
+
             df = df[df['Date'] != 'Date']  # Remove header rows
             
             df['scraped_at'] = datetime.now().isoformat()
             
-            logger.info(f"Scraped {len(df)} games from schedule")
+            logger.info("Scraped %d games from schedule", len(df))
             return df
             
         except Exception as e:
-            logger.error(f"Error scraping schedule: {e}")
+            logger.error("Error scraping schedule: %s", e)
             return None
     
+    def scrape_season_data(self, season=CURRENT_SEASON):
+        """Fetch season stats and the schedule concurrently
+
+        The two GETs are independent, so their waits overlap in the
+        pool while the shared limiter keeps the request spacing.
+        """
+        stats_future = self._executor.submit(self.scrape_player_season_stats, season)
+        schedule_future = self._executor.submit(self.scrape_team_schedules, season)
+
+        return stats_future.result(), schedule_future.result()
+
     def calculate_rolling_averages(self, df, player_col='Player', windows=[5, 10]):
         """Calculate rolling averages for key stats"""
         if df is None or df.empty:
             return df
         
-        df = df.sort_values(['Player', 'Date'])
-        
+        df = df.sort_values([player_col, 'Date'], kind='stable')
+
+        stats = [stat for stat in ('PTS', 'TRB', 'AST') if stat in df.columns]
+        if not stats:
+            return df
+
+        # One Cython rolling pass over all stat columns per window,
+        # instead of a Python lambda dispatched per group
+        grouped = df.groupby(player_col, sort=False)[stats]
+
         for window in windows:
-            for stat in ['PTS', 'TRB', 'AST']:
-                if stat in df.columns:
-                    col_name = f"{stat.lower()}_last_{window}"
-                    df[col_name] = df.groupby(player_col)[stat].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean()
-                    )
-        
+            rolled = (
+                grouped.rolling(window, min_periods=1).mean()
+                .reset_index(level=0, drop=True)
+            )
+            for stat in stats:
+                df[f"{stat.lower()}_last_{window}"] = rolled[stat]
+
         return df
     
     def update_player_stats(self):
         """Update player stats incrementally"""
         logger.info("Updating player statistics...")
         
-        # Check if we have existing data
+        # Check if we have existing data; season must stay str so the
+        # upsert keys align with the freshly scraped rows (the CSV
+        # round-trip would otherwise parse it back as int64)
         try:
-            existing_df = pd.read_csv(PLAYER_STATS_CSV)
-            logger.info(f"Found existing stats with {len(existing_df)} records")
+            existing_df = pd.read_csv(PLAYER_STATS_CSV, dtype={'season': str})
+            logger.info("Found existing stats with %d records", len(existing_df))
         except FileNotFoundError:
             existing_df = None
             logger.info("No existing stats found, performing full scrape")
         
-        # Scrape current season stats
-        new_df = self.scrape_player_season_stats(season=CURRENT_SEASON)
-        
+        # Scrape current season stats and the schedule concurrently
+        new_df, schedule_df = self.scrape_season_data(season=CURRENT_SEASON)
+
         if new_df is None:
             logger.error("Failed to scrape new stats")
             return False
+
+        if schedule_df is not None:
+            schedule_df.to_csv(SCHEDULE_CSV, index=False)
+            logger.info("Saved %d scheduled games", len(schedule_df))
         
         # Merge with existing data if available
         if existing_df is not None:
-            # Combine and deduplicate
-            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-            combined_df = combined_df.drop_duplicates(
-                subset=['Player', 'Team', 'season'], 
-                keep='last'
+            # Keyed upsert: fresh rows take precedence for their
+            # (Player, Team, season) key, untouched history is kept,
+            # and no concat-then-dedupe pass over both frames runs
+            key_cols = ['Player', 'Team', 'season']
+            new_df['season'] = new_df['season'].astype(str)
+            existing_df['season'] = existing_df['season'].astype(str)
+            combined_df = (
+                new_df.set_index(key_cols)
+                .combine_first(existing_df.set_index(key_cols))
+                .reset_index()
             )
         else:
             combined_df = new_df
         
-        # Save updated stats
+        # Save updated stats - Parquet for internal readers, CSV as the
+        # user-facing copy
+        combined_df.to_parquet(PLAYER_STATS_PARQUET, engine='pyarrow')
         combined_df.to_csv(PLAYER_STATS_CSV, index=False)
-        logger.info(f"Saved {len(combined_df)} player stat records")
+        logger.info("Saved %d player stat records", len(combined_df))
         
-        # Update checkpoint
-        self.save_checkpoint({
+        # Update checkpoint (preserving the stored ETags)
+        self.checkpoint_data.update({
             'last_update': datetime.now().isoformat(),
             'records_count': len(combined_df)
         })
+        self.save_checkpoint(self.checkpoint_data)
         
         return True
     
     def get_player_stats(self, player_name):
-        """Get stats for a specific player"""
+        """Get stats for a specific player via a hashed name index"""
         try:
-            df = pd.read_csv(PLAYER_STATS_CSV)
-            player_data = df[df['Player'].str.contains(player_name, case=False, na=False)]
-            
-            if player_data.empty:
-                logger.warning(f"No stats found for {player_name}")
+            mtime = os.path.getmtime(PLAYER_STATS_CSV)
+
+            if self._stats_cache is None or mtime != self._stats_mtime:
+                df = pd.read_csv(PLAYER_STATS_CSV)
+
+                # Keep the first (most recent) row per lowercased name
+                player_index = {}
+                for idx, name in zip(df.index, df['Player'].fillna('').str.lower()):
+                    player_index.setdefault(name, idx)
+
+                self._stats_cache = df
+                self._stats_mtime = mtime
+                self._player_index = player_index
+
+            idx = self._player_index.get(player_name.lower())
+
+            if idx is None:
+                logger.warning("No stats found for %s", player_name)
                 return None
-            
-            # Return most recent stats
-            return player_data.iloc[0].to_dict()
-            
+
+            return self._stats_cache.loc[idx].to_dict()
+
         except Exception as e:
-            logger.error(f"Error getting player stats: {e}")
+            logger.error("Error getting player stats: %s", e)
             return None
     
     def enrich_with_advanced_stats(self, df):
         """Calculate additional advanced statistics"""
         if 'PTS' in df.columns and 'TRB' in df.columns and 'AST' in df.columns:
-            df['pts_reb_ast_avg'] = df['PTS'] + df['TRB'] + df['AST']
+            # eval lowers to numexpr's threaded SIMD backend when it is
+            # installed, fusing the chained adds without temporaries
+            df.eval('pts_reb_ast_avg = PTS + TRB + AST', inplace=True)
         
         if 'MP' in df.columns and df['MP'].notna().any():
-            # Usage rate approximation (simplified)
-            df['usage_rate'] = (df['FGA'] + 0.44 * df['FTA'] + df['TOV']) / df['MP']
-            df['usage_rate'] = df['usage_rate'].fillna(0)
-        
+            # Usage rate approximation (simplified); zero/NaN-minute
+            # rows clamp to 0 in the same pass, no fillna rewrite
+            usage = (
+                df['FGA'].to_numpy(dtype=float)
+                + 0.44 * df['FTA'].to_numpy(dtype=float)
+                + df['TOV'].to_numpy(dtype=float)
+            )
+            mp = df['MP'].to_numpy(dtype=float)
+            usage_rate = np.zeros_like(usage)
+            np.divide(usage, mp, out=usage_rate, where=(mp > 0))
+            df['usage_rate'] = np.nan_to_num(usage_rate, copy=False)
+
         if 'FG' in df.columns and 'FGA' in df.columns and '3P' in df.columns:
             # True shooting percentage
-            df['true_shooting_pct'] = df['PTS'] / (2 * (df['FGA'] + 0.44 * df['FTA']))
-            df['true_shooting_pct'] = df['true_shooting_pct'].fillna(0)
+            ts_denom = 2.0 * (
+                df['FGA'].to_numpy(dtype=float)
+                + 0.44 * df['FTA'].to_numpy(dtype=float)
+            )
+            true_shooting = np.zeros_like(ts_denom)
+            np.divide(
+                df['PTS'].to_numpy(dtype=float), ts_denom,
+                out=true_shooting, where=(ts_denom > 0)
+            )
+            df['true_shooting_pct'] = np.nan_to_num(true_shooting, copy=False)
         
         return df
 